@@ -1,6 +1,27 @@
-from text import longest_common_substring
-from text._utils import suffix_array
+from text import (
+    prefixes_by_occurences,
+    streamed_prefixes_by_occurences,
+    longest_common_prefix,
+    shortest_common_prefix,
+    longest_common_suffix,
+    shortest_common_suffix,
+    longest_common_substring,
+    longest_common_substring_among,
+    repeated_substrings,
+    estimate_suffix_array_memory,
+    SuffixIndex,
+    SerializedFormatError,
+    ConcurrentTrie,
+    FrozenTrie,
+    groups_by_prefixes,
+    iter_groups_by_prefixes,
+    FrontCodedStringSet,
+)
+from text._utils import suffix_array, Trie, _fit_memory, _shards
 import itertools
+import mmap
+import threading
+from pytest import raises
 
 
 class HelperTestMixin:
@@ -9,9 +30,9 @@ class HelperTestMixin:
     source: https://stackoverflow.com/questions/51456472/python-fastest-algorithm-to-get-the-most-common-prefix-out-of-a-list-of-strings/51457611
     """
 
-    def suffix_verify(self, text, step=16):
+    def suffix_verify(self, text, step=16, engine="doubling"):
         tx = text
-        sa, _, lcp = suffix_array(text=tx, _step=step)
+        sa, _, lcp = suffix_array(text=tx, _step=step, engine=engine)
         assert set(sa) == set(range(len(tx)))
         ok = True
         for i0, i1, h in zip(sa[:-1], sa[1:], lcp[1:]):
@@ -59,3 +80,533 @@ class TestSuffixArray(HelperTestMixin):
         assert longest_common_substring("banana") == expect
         expect = {" s": [3, 21], "no": [0, 13], "o ": [5, 20, 38]}
         assert longest_common_substring("not so Agamemnon, who spoke fiercely to ") == expect
+
+
+class TestSuffixArraySais(HelperTestMixin):
+    @staticmethod
+    def as_lists(arrays):
+        return tuple(map(list, arrays))
+
+    def test_banana(self):
+        expect = ([5, 3, 1, 0, 4, 2], [3, 2, 5, 1, 4, 0], [0, 1, 3, 0, 0, 2])
+        assert self.as_lists(suffix_array(text="banana", engine="sais")) == expect
+        assert self.as_lists(suffix_array(text=b"banana", engine="sais")) == expect
+
+    def test_mini(self):
+        assert self.as_lists(suffix_array(text="", engine="sais")) == ([], [], [])
+        assert self.as_lists(suffix_array(text="a", engine="sais")) == ([0], [0], [0])
+        assert self.as_lists(suffix_array(text="aa", engine="sais")) == ([1, 0], [1, 0], [0, 1])
+        assert self.as_lists(suffix_array(text="aaa", engine="sais")) == (
+            [2, 1, 0],
+            [2, 1, 0],
+            [0, 1, 2],
+        )
+
+    def test_same_as_doubling(self):
+        for size in range(9):
+            for cartesian in itertools.product(*(size * ["ABC"])):
+                text = "".join(cartesian)
+                assert self.as_lists(suffix_array(text, engine="sais")) == suffix_array(text, 1)
+
+    def test_example(self):
+        self.suffix_verify("abracadabra", engine="sais")
+        self.suffix_verify("Łódź, źdźbło, żółw", engine="sais")
+
+    def test_lcp(self):
+        expect = {" s": [3, 21], "no": [0, 13], "o ": [5, 20, 38]}
+        text = "not so Agamemnon, who spoke fiercely to "
+        assert longest_common_substring(text, engine="sais") == expect
+
+    def test_max_memory(self):
+        text = "abracadabra" * 100
+        expect = suffix_array(text, 1)
+        budget = estimate_suffix_array_memory(len(text), 1)
+        assert suffix_array(text, 64, max_memory=budget) == expect
+
+        budget = estimate_suffix_array_memory(len(text), engine="sais")
+        assert self.as_lists(suffix_array(text, max_memory=budget)) == expect
+
+        with raises(MemoryError):
+            suffix_array(text, max_memory=budget - 1)
+
+    def test_max_memory_char_size(self):
+        texts = {1: "caf\xe9" * 100, 2: "\u0437\u0430" * 200, 4: "\U0001f600" * 400}
+        for char_size, text in texts.items():
+            budget = estimate_suffix_array_memory(len(text), 64, char_size=char_size)
+            assert _fit_memory(text, 64, "doubling", budget) == ("doubling", 64)
+            assert _fit_memory(text, 64, "doubling", budget - 1) != ("doubling", 64)
+
+    def test_memory_estimate(self):
+        n = 10**6
+        assert estimate_suffix_array_memory(n, 64) > estimate_suffix_array_memory(n, 16)
+        assert estimate_suffix_array_memory(n, 64, char_size=4) > estimate_suffix_array_memory(
+            n, 64
+        )
+        assert estimate_suffix_array_memory(n, engine="sais") < estimate_suffix_array_memory(n, 1)
+
+    def test_unknown_engine(self):
+        with raises(ValueError):
+            suffix_array("banana", engine="quicksort")  # type: ignore
+
+
+class TestSuffixIndex:
+    TEXT = "not so Agamemnon, who spoke fiercely to "
+
+    @staticmethod
+    def naive_find(text, pattern):
+        return [i for i in range(len(text)) if text.startswith(pattern, i)]
+
+    def test_queries(self):
+        for use_lcp in (False, True):
+            index = SuffixIndex(self.TEXT, use_lcp=use_lcp)
+            for pattern in ("o", "no", "o ", "Agamemnon", "mem", "x", "to  ", " "):
+                expect = self.naive_find(self.TEXT, pattern)
+                assert index.find(pattern) == expect
+                assert index.count(pattern) == len(expect)
+                assert index.contains(pattern) == bool(expect)
+                assert (pattern in index) == bool(expect)
+
+    def test_cartesian(self):
+        for text in map("".join, itertools.product(*(6 * ["ab"]))):
+            index = SuffixIndex(text, use_lcp=len(text) % 2 == 0)
+            for pattern in map("".join, itertools.product(*(3 * ["ab"]))):
+                assert index.find(pattern) == self.naive_find(text, pattern)
+
+    def test_bytes(self):
+        index = SuffixIndex(b"abracadabra", engine="doubling")
+        assert index.find(b"abra") == [0, 7]
+        assert index.count(b"a") == 5
+
+    def test_empty(self):
+        assert SuffixIndex("").find("a") == []
+        assert SuffixIndex("abc").count("") == 3
+
+
+class TestSuffixIndexPersistence:
+    TEXT = b"not so Agamemnon, who spoke fiercely to "
+
+    def test_roundtrip_mmap(self, tmp_path):
+        corpus_path = tmp_path / "corpus.bin"
+        corpus_path.write_bytes(self.TEXT)
+        with open(corpus_path, "rb") as f:
+            corpus = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        built = SuffixIndex(corpus)
+        built.save(tmp_path / "corpus.sa")
+        with SuffixIndex.load(tmp_path / "corpus.sa", corpus, use_lcp=True) as loaded:
+            assert list(loaded.suffix_array) == list(built.suffix_array)
+            assert list(loaded.lcp) == list(built.lcp)
+            for pattern in (b"o", b"no", b"Agamemnon", b"x"):
+                assert loaded.find(pattern) == built.find(pattern)
+        corpus.close()
+
+    def test_other_text(self, tmp_path):
+        SuffixIndex(self.TEXT).save(tmp_path / "corpus.sa")
+        with raises(SerializedFormatError):
+            SuffixIndex.load(tmp_path / "corpus.sa", self.TEXT[::-1], verify=True)
+        with raises(SerializedFormatError):
+            SuffixIndex.load(tmp_path / "corpus.sa", self.TEXT[1:])
+
+    def test_corrupted(self, tmp_path):
+        SuffixIndex(self.TEXT).save(tmp_path / "corpus.sa")
+        data = bytearray((tmp_path / "corpus.sa").read_bytes())
+        data[-8] ^= 1
+        (tmp_path / "corpus.sa").write_bytes(data)
+        with raises(SerializedFormatError):
+            SuffixIndex.load(tmp_path / "corpus.sa", self.TEXT, verify=True)
+
+        (tmp_path / "corpus.sa").write_bytes(b"PYSB" + data[4:])
+        with raises(SerializedFormatError):
+            SuffixIndex.load(tmp_path / "corpus.sa", self.TEXT)
+
+
+class TestLongestCommonSubstringAmong:
+    def test_all(self):
+        expect = {"ana": [(0, 1), (0, 3), (1, 0), (1, 2), (2, 3)]}
+        assert longest_common_substring_among("banana", "ananas", "cabana") == expect
+
+    def test_k(self):
+        expect = {"anana": [(0, 1), (1, 0)]}
+        assert longest_common_substring_among("banana", "ananas", "cabana", k=2) == expect
+        expect = {"ab": [(0, 0), (1, 2)], "bc": [(1, 0), (2, 1)]}
+        assert longest_common_substring_among("abx", "bcab", "xbc", k=2) == expect
+
+    def test_nothing_shared(self):
+        assert longest_common_substring_among("abc", "def") == {}
+        assert longest_common_substring_among("abc", "") == {}
+
+    def test_invalid_k(self):
+        with raises(ValueError):
+            longest_common_substring_among("abc", "abd", k=3)
+        with raises(ValueError):
+            longest_common_substring_among("abc", "abd", k=1)
+
+
+class TestRepeatedSubstrings:
+    def test_all(self):
+        expect = [("ana", [1, 3]), ("na", [2, 4]), ("a", [1, 3, 5])]
+        assert list(repeated_substrings("banana")) == expect
+        assert list(repeated_substrings("banana", engine="doubling")) == expect
+
+    def test_k_and_min_len(self):
+        text = "not so Agamemnon, who spoke fiercely to "
+        expect = [(" s", [3, 21]), ("no", [0, 13]), ("o ", [5, 20, 38])]
+        assert list(repeated_substrings(text, 3)) == expect
+        assert list(repeated_substrings(text, min_len=2)) == expect
+        assert list(repeated_substrings("abcabc", 10, min_len=3)) == [("abc", [0, 3])]
+
+    def test_non_overlapping(self):
+        assert list(repeated_substrings("aaaa", non_overlapping=True)) == [
+            ("aa", [0, 2]),
+            ("a", [0, 1, 2, 3]),
+        ]
+        assert list(repeated_substrings("banana", 1, non_overlapping=True)) == [("an", [1, 3])]
+
+    def test_lazy(self):
+        substrings = repeated_substrings("abracadabra")
+        assert next(substrings) == ("abra", [0, 7])
+
+    def test_no_repeats(self):
+        assert list(repeated_substrings("")) == []
+        assert list(repeated_substrings("abc")) == []
+
+
+class TestTrie:
+    STRINGS = ["file_1", "file_2", "file_3", "not_a_file_1", "not_a_file_2"]
+
+    def test_prefixes_by_occurences(self):
+        trie = Trie()
+        trie.insert(*self.STRINGS)
+        expect = [
+            ("not_a_file_", 2),
+            ("not_a_file", 2),
+            ("not_a_fil", 2),
+            ("not_a_fi", 2),
+            ("not_a_f", 2),
+            ("not_a_", 2),
+            ("not_a_file_2", 1),
+            ("not_a_file_1", 1),
+            ("file_3", 1),
+            ("file_2", 1),
+            ("file_1", 1),
+        ]
+        assert trie.getPrefixesByOccurences(6) == expect
+        assert trie.getPrefixesByOccurences(6, ascending_order=True) == expect[::-1]
+
+    def test_root(self):
+        trie = Trie()
+        trie.insert(*self.STRINGS)
+        assert trie.getPrefixesByOccurences(0)[0] == ("", len(self.STRINGS))
+
+    def test_long_string(self):
+        trie = Trie()
+        trie.insert("x" * 100_000)
+        assert len(trie) == 100_001
+        assert trie.getPrefixesByOccurences(100_000) == [("x" * 100_000, 1)]
+
+    def test_incremental(self):
+        trie = Trie()
+        trie.insert(*self.STRINGS)
+        trie.getPrefixesByOccurences(1)
+        trie.insert("file_4", "file_1")
+        trie.remove("not_a_file_2")
+
+        expect = Trie()
+        expect.insert("file_1", "file_1", "file_2", "file_3", "file_4", "not_a_file_1")
+        assert trie.getPrefixesByOccurences(1) == expect.getPrefixesByOccurences(1)
+        assert trie.getPrefixesByOccurences(3, True) == expect.getPrefixesByOccurences(3, True)
+        assert len(trie) == len(expect)
+
+    def test_remove(self):
+        trie = Trie()
+        trie.insert(*self.STRINGS)
+        trie.remove(*self.STRINGS[1:])
+        assert trie.prefix_count("file") == 1
+        assert trie.prefix_count("not") == 0
+        assert "file_1" in trie
+        assert "file_2" not in trie
+        assert "file" not in trie
+
+        with raises(KeyError):
+            trie.remove("file")
+
+        trie.remove("file_1")
+        assert len(trie) == 1
+        assert trie.getPrefixesByOccurences(0) == []
+
+    def test_top_k_prefixes(self):
+        trie = Trie()
+        trie.insert(*self.STRINGS)
+        for k in range(15):
+            for min_len in range(8):
+                for ascending_order in (False, True):
+                    expect = trie.getPrefixesByOccurences(min_len, ascending_order)[:k]
+                    assert trie.top_k_prefixes(k, min_len, ascending_order) == expect
+
+    def test_complete(self):
+        trie = Trie()
+        trie.insert("auth", "auth", "audit", "billing", "auth-v2", "audit")
+        assert trie.complete("au", 2) == [("audit", 2), ("auth", 2)]
+        assert trie.complete("", 10)[-1] == ("billing", 1)
+        assert trie.complete("x", 3) == trie.complete("au", 0) == []
+
+        trie.insert("auth-v2", "auth-v2")
+        trie.remove("audit")
+        assert trie.complete("au", 2) == [("auth-v2", 3), ("auth", 2)]
+        assert trie.complete("aut", 20) == [("auth-v2", 3), ("auth", 2)]
+        trie.remove("auth-v2", "auth-v2", "auth-v2")
+        assert trie.complete("auth") == [("auth", 2)]
+
+    def test_merge(self):
+        trie = Trie()
+        trie.insert(*self.STRINGS[:3], "not")
+        trie.getPrefixesByOccurences(1)
+        other = Trie()
+        other.insert(*self.STRINGS[2:])
+        trie.merge(other)
+
+        expect = Trie()
+        expect.insert(*self.STRINGS, "file_3", "not")
+        assert trie.getPrefixesByOccurences(1) == expect.getPrefixesByOccurences(1)
+        assert len(trie) == len(expect)
+
+    def test_from_strings(self):
+        strings = [f"/srv/{kind}/{i}" for kind in ("file", "dir", "link") for i in range(20)]
+        strings += ["/srv/", "/srv/file/1", ""]
+        assert len(_shards(strings, 3)) == 3
+        expect = Trie()
+        expect.insert(*strings)
+        for workers in (1, 3):
+            trie = Trie.from_strings(strings, workers=workers)
+            assert trie.getPrefixesByOccurences(0) == expect.getPrefixesByOccurences(0)
+            assert len(trie) == len(expect)
+        assert len(Trie.from_strings([], workers=2)) == 1
+
+    def test_prefixes_by_occurences_workers(self):
+        strings = [f"https://x.io/{kind}/{i % 7}" for kind in ("a", "b") for i in range(30)]
+        strings += ["https://x.io/", "https://y.io/"]
+        assert len(_shards(strings, 3)) == 3
+        for min_len in (0, 1, 4):
+            for ascending_order in (False, True):
+                assert prefixes_by_occurences(
+                    *strings,
+                    with_occurences=True,
+                    min_len=min_len,
+                    ascending_order=ascending_order,
+                    workers=3,
+                ) == prefixes_by_occurences(
+                    *strings, with_occurences=True, min_len=min_len, ascending_order=ascending_order
+                )
+        assert prefixes_by_occurences(workers=2) == []
+
+
+class TestConcurrentTrie:
+    def test_matches_trie(self):
+        strings = TestTrie.STRINGS + ["", "f", "x"]
+        expect = Trie()
+        expect.insert(*strings)
+        for key_len in (1, 3, 16):
+            trie = ConcurrentTrie(stripes=3, key_len=key_len)
+            trie.insert(*strings)
+            for min_len in range(5):
+                for ascending_order in (False, True):
+                    assert trie.getPrefixesByOccurences(
+                        min_len, ascending_order
+                    ) == expect.getPrefixesByOccurences(min_len, ascending_order)
+            assert len(trie) == len(expect) == len(trie.snapshot())
+            for prefix in ("", "f", "file_", "not_a_file_2", "x", "y"):
+                assert trie.prefix_count(prefix) == expect.prefix_count(prefix)
+            assert "" in trie and "file" not in trie
+
+    def test_threaded_stress(self):
+        trie = ConcurrentTrie(stripes=4)
+        threads_count, rounds = 8, 200
+
+        def work(thread):
+            for i in range(rounds):
+                trie.insert(f"{i % 7}/shared", f"{thread}/{i}", "")
+                if i % 2:
+                    trie.remove(f"{thread}/{i}")
+
+        threads = [threading.Thread(target=work, args=(t,)) for t in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expect = Trie()
+        for thread in range(threads_count):
+            for i in range(rounds):
+                expect.insert(f"{i % 7}/shared", *([] if i % 2 else [f"{thread}/{i}"]), "")
+
+        assert trie.prefix_count("") == threads_count * rounds * 5 // 2
+        for prefix in ("0/", "1/s", "7/1"):
+            assert trie.prefix_count(prefix) == expect.prefix_count(prefix)
+        assert trie.getPrefixesByOccurences(0) == expect.getPrefixesByOccurences(0)
+        assert trie.snapshot().getPrefixesByOccurences(0) == expect.getPrefixesByOccurences(0)
+
+    def test_threaded_stress_shared_leading_character(self):
+        trie = ConcurrentTrie(stripes=4, key_len=4)
+        threads_count, rounds = 8, 200
+
+        def work(thread):
+            for i in range(rounds):
+                trie.insert(f"/shared/{i % 7}", f"/{thread}/{i}")
+                if i % 2:
+                    trie.remove(f"/{thread}/{i}")
+
+        threads = [threading.Thread(target=work, args=(t,)) for t in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expect = Trie()
+        for thread in range(threads_count):
+            for i in range(rounds):
+                expect.insert(f"/shared/{i % 7}", *([] if i % 2 else [f"/{thread}/{i}"]))
+
+        assert sum(len(stripe) > 1 for stripe in trie._tries) > 1
+        for prefix in ("", "/", "/0", "/1/10", "/shared/3"):
+            assert trie.prefix_count(prefix) == expect.prefix_count(prefix)
+        for min_len in (0, 2, 5):
+            assert trie.getPrefixesByOccurences(min_len) == expect.getPrefixesByOccurences(min_len)
+        assert len(trie) == len(expect)
+
+
+class TestFrozenTrie:
+    def test_roundtrip_mmap(self, tmp_path):
+        trie = Trie()
+        trie.insert(*TestTrie.STRINGS, "file_1", "")
+        FrozenTrie.from_trie(trie).save(tmp_path / "names.trie")
+        with FrozenTrie.load(tmp_path / "names.trie") as frozen:
+            assert len(frozen) == len(trie)
+            for min_len in (0, 6):
+                for ascending_order in (False, True):
+                    assert frozen.getPrefixesByOccurences(
+                        min_len, ascending_order
+                    ) == trie.getPrefixesByOccurences(min_len, ascending_order)
+            for prefix in ("", "f", "file_1", "not_a_file_", "x", "file_10"):
+                assert frozen.prefix_count(prefix) == trie.prefix_count(prefix)
+                assert (prefix in frozen) == (prefix in trie)
+
+    def test_bytes(self):
+        trie = Trie()
+        trie.insert(*TestTrie.STRINGS)
+        frozen = FrozenTrie.from_trie(trie)
+        assert all(array.itemsize == 4 for array in frozen._arrays())
+        data = bytearray(frozen.to_bytes())
+        assert FrozenTrie.from_bytes(data).prefix_count("not") == 2
+
+        data[-1] ^= 1
+        with raises(SerializedFormatError):
+            FrozenTrie.from_bytes(data)
+
+
+class TestCommonAffixes:
+    def test_prefix(self):
+        assert longest_common_prefix("interstellar", "internet", "interval") == "inter"
+        assert longest_common_prefix("abc") == "abc"
+        assert longest_common_prefix("abc", "xbc") is None
+        assert shortest_common_prefix("abc", "abd") == "a"
+        assert shortest_common_prefix("abc", "abd", min_len=2) == "ab"
+        assert shortest_common_prefix("abc", "abd", min_len=3) is None
+
+    def test_suffix(self):
+        assert longest_common_suffix("a.tar.gz", "b.tar.gz", "c.gz") == ".gz"
+        assert longest_common_suffix("abc", "abx") is None
+        assert shortest_common_suffix("a.log", "b.log", min_len=2) == "og"
+        assert shortest_common_suffix("a.log", "b.log", min_len=6) is None
+
+    def test_iterable(self):
+        paths = ["/srv/app/a.log", "/srv/app/b.log", "/srv/api/c.log"]
+        assert longest_common_prefix(iter(paths)) == "/srv/ap"
+        assert longest_common_suffix(path for path in paths) == ".log"
+        assert longest_common_prefix([]) is None
+        assert longest_common_suffix([]) is None
+
+
+class TestGroupsByPrefixes:
+    def test_groups(self):
+        expect = [
+            ["file_", "file_1", "file_2", "file_3"],
+            ["not_a_file_", "not_a_file_1", "not_a_file_2"],
+        ]
+        assert groups_by_prefixes(*reversed(TestTrie.STRINGS)) == expect
+        assert groups_by_prefixes("a", "ab", "abc", "abd", "b", "a") == [
+            ["a", "a", ["ab", "ab", "abc", "abd"]],
+            "b",
+        ]
+        assert groups_by_prefixes() == []
+
+    def test_min_len(self):
+        assert groups_by_prefixes("a", "ab", "abc", "abd", "b", min_len=2) == [
+            "a",
+            ["ab", "ab", "abc", "abd"],
+            "b",
+        ]
+        assert groups_by_prefixes("ab", "ac", min_len=2) == ["ab", "ac"]
+
+    def test_iter(self):
+        keys = sorted(f"{shard:02}/{key}" for shard in range(20) for key in range(100))
+        groups = iter_groups_by_prefixes(iter(keys), presorted=True)
+        assert next(groups) == groups_by_prefixes(*keys[:1000])[0]
+        assert list(iter_groups_by_prefixes(reversed(keys))) == groups_by_prefixes(*keys)
+        with raises(ValueError):
+            list(iter_groups_by_prefixes(["b", "a"], presorted=True))
+
+
+class TestFrontCodedStringSet:
+    KEYS = sorted(
+        f"s3://logs/{year}/{month:02}/{i}.gz"
+        for year in (2023, 2024)
+        for month in range(1, 13)
+        for i in range(3)
+    )
+
+    def test_queries(self):
+        for block_size in (1, 5, 16):
+            strings = self.KEYS + ["\u00e9t\u00e9"]
+            keys = FrontCodedStringSet(reversed(strings), block_size=block_size)
+            assert list(keys) == strings
+            assert len(keys) == len(self.KEYS) + 1
+            assert self.KEYS[7] in keys and "\u00e9t\u00e9" in keys
+            assert "s3://logs/2023" not in keys and "" not in keys
+            assert [keys[i] for i in range(len(self.KEYS))] == self.KEYS
+            assert keys.rank("s3://logs/2024/") == len(self.KEYS) // 2
+            assert keys.rank("") == 0 and keys.rank("\uffff") == len(keys)
+            assert list(keys.iter_prefix("s3://logs/2024/03/")) == self.KEYS[42:45]
+            with raises(IndexError):
+                keys[len(keys)]
+
+    def test_bytes(self):
+        keys = FrontCodedStringSet(self.KEYS)
+        data = bytearray(keys.to_bytes())
+        loaded = FrontCodedStringSet.from_bytes(data)
+        assert list(loaded) == self.KEYS
+        assert loaded.rank(self.KEYS[20]) == 20 and loaded[-1] == self.KEYS[-1]
+
+        data[-1] ^= 1
+        with raises(SerializedFormatError):
+            FrontCodedStringSet.from_bytes(data)
+
+
+class TestStreamedPrefixesByOccurences:
+    STRINGS = ["/api/users/1", "/api/users/2", "/api/items/1", "/static/a.css", "/static/b.js"]
+
+    def test_exact_when_fits(self):
+        result = streamed_prefixes_by_occurences(iter(self.STRINGS), max_nodes=1000)
+        expect = prefixes_by_occurences(*self.STRINGS, with_occurences=True)
+        assert [(prefix, occurences) for prefix, occurences, _ in result] == expect
+        assert all(error == 0 for *_, error in result)
+
+    def test_bounded(self):
+        strings = [f"/api/users/{i}" for i in range(500)] + self.STRINGS * 100
+        expect = dict(prefixes_by_occurences(*strings, with_occurences=True))
+        result = streamed_prefixes_by_occurences(
+            (s for s in strings), max_nodes=50, ascending_order=True
+        )
+        assert 0 < len(result) < 50
+        for prefix, occurences, error in result:
+            assert occurences <= expect[prefix] <= occurences + error
+        assert ("/api/", 800, 0) in result
@@ -1,4 +1,18 @@
-from text.transform.case_conversion import converted_case, Case
+from text.transform.case_conversion import (
+    converted_case,
+    case_converter,
+    word_bounds,
+    convert_keys,
+    iter_convert_keys,
+    converted_case_batch,
+    detect_case,
+    detect_case_batch,
+    Case,
+    _ASCII_WORDS,
+)
+import itertools
+import pytest
+from text import split_camel_case
 
 
 class TestConvertedCase:
@@ -53,3 +67,115 @@ class TestConvertedCase:
         assert converted_case("lorem-ipsum", "-", None) == "loremIpsum"
         assert converted_case("lorem-ipsum", "-", "camel") == "loremIpsum"
         assert converted_case("lorem-ipsum", "kebab", None) == "loremIpsum"
+
+
+class TestCaseConverter:
+    def test_matches_converted_case(self):
+        texts = ["loremIpsum", "LoremIpsum", "lorem", "$!@#%!@$@!#@loremIpsum", "HTTPRequest", ""]
+        for new_case in ("camel", "snake", "kebab"):
+            for capitalize_first_letter in (False, True):
+                convert = case_converter(
+                    "camel", new_case, capitalize_first_letter=capitalize_first_letter
+                )
+                for text in texts:
+                    assert convert(text) == converted_case(
+                        text, "camel", new_case, capitalize_first_letter=capitalize_first_letter
+                    )
+
+    def test_custom_sep_and_memo(self):
+        convert = case_converter(".", "snake", memo_size=2)
+        assert convert("lorem.ipsum") == convert("lorem.ipsum") == "lorem_ipsum"
+        assert convert.cache_info().hits == 1  # type: ignore
+        assert case_converter("snake", None, capitalize_first_letter=True)("a_b") == "AB"
+
+
+class TestWordBounds:
+    def test_bounds(self):
+        assert word_bounds("parseHTTPRequest2Json") == [0, 5, 9, 17, 21]
+        assert word_bounds("lorem") == [0, 5]
+        assert word_bounds("") == [0]
+        assert word_bounds("$!loremIpsum") == [0, 7, 12]
+
+    def test_ascii_words_match_bounds(self):
+        for size in range(7):
+            for chars in itertools.product("aA_1", repeat=size):
+                text = "".join(chars)
+                words = _ASCII_WORDS.findall(text)
+                assert [0, *itertools.accumulate(map(len, words))] == word_bounds(text)
+                assert "".join(map(str.lower, words)) == text.lower()
+
+    def test_digits_and_unicode(self):
+        assert converted_case("HTTP2Request", "camel", "snake") == "http2_request"
+        assert converted_case("userID2", "camel", "kebab") == "user-id2"
+        assert converted_case("\u00c9coleNormale", "camel", "snake") == "\u00e9cole_normale"
+        assert converted_case("stra\u00dfeNummer", "camel", "kebab") == "stra\u00dfe-nummer"
+
+    def test_split_camel_case(self):
+        assert split_camel_case("parseHTTPRequest", " ") == "parse HTTP Request"
+        assert split_camel_case("loremIpsum") == "loremIpsum"
+
+
+class TestConvertKeys:
+    def test_nested(self):
+        payload = {"userId": 1, "orderItems": [{"itemId": 2, "unitPrice": 3}], "raw": [1, {"a": 2}]}
+        converted = convert_keys(payload, "camel", "snake")
+        assert converted == {
+            "user_id": 1,
+            "order_items": [{"item_id": 2, "unit_price": 3}],
+            "raw": [1, {"a": 2}],
+        }
+        assert converted["raw"] is payload["raw"]
+        assert convert_keys(converted, "snake", "camel") == payload
+
+    def test_unchanged_not_copied(self):
+        payload = {"user_id": [{"a": {1: "b"}}], "x": "userId"}
+        assert convert_keys(payload, "camel", "snake") is payload
+
+    def test_colliding_keys(self):
+        with pytest.raises(ValueError, match="'user_id'"):
+            convert_keys({"a": [{"userId": 1, "user_id": 2}]}, "camel", "snake")
+
+    def test_iter(self):
+        records = iter([{"a_b": 1}, {"c_d": [{"e_f": 2}]}])
+        assert list(iter_convert_keys(records, "snake", "kebab")) == [
+            {"a-b": 1},
+            {"c-d": [{"e-f": 2}]},
+        ]
+
+
+class TestBatch:
+    NAMES = ["userId", "createdAt", "userId", "HTTPStatus", "createdAt"]
+
+    def test_converted_case_batch(self):
+        expect = [converted_case(name, "camel", "snake") for name in self.NAMES]
+        assert converted_case_batch(self.NAMES, "camel", "snake") == expect
+        assert converted_case_batch(iter(self.NAMES), "camel", "snake") == expect
+        assert converted_case_batch([], "camel", "snake") == []
+
+    def test_detect_case(self):
+        assert detect_case("user_id") == "snake"
+        assert detect_case("user-id") == "kebab"
+        assert detect_case("userId") == detect_case("user") == "camel"
+        assert detect_case("user_id-2") is None
+        for text in ("First Name", "user\tid", "123", "_-_", "", " "):
+            assert detect_case(text) is None
+        assert detect_case("USER") == detect_case("HTTP2") == "camel"
+        assert converted_case("USER", "camel", "snake") == "user"
+        assert detect_case("USER_ID") == "snake" and detect_case("żółw") == "camel"
+        assert detect_case_batch(["a_b", "aB", "a_b", "a-b_c"]) == ["snake", "camel", "snake", None]
+
+    def test_numpy(self):
+        numpy = pytest.importorskip("numpy")
+        names = numpy.array(self.NAMES[:4]).reshape(2, 2)
+        converted = converted_case_batch(names, "camel", "kebab")
+        assert converted.shape == (2, 2) and converted.dtype.kind == "U"
+        assert converted.ravel().tolist() == [
+            converted_case(name, "camel", "kebab") for name in self.NAMES[:4]
+        ]
+        assert detect_case_batch(numpy.array(["a_b", "a-b_c"])).tolist() == ["snake", None]
+
+        converted = converted_case_batch(
+            numpy.array([b"userId", "créé".encode()]), "camel", "snake"
+        )
+        assert converted.dtype.kind == "U" and converted.tolist() == ["user_id", "créé"]
+        assert detect_case_batch(numpy.array([b"a_b"])).tolist() == ["snake"]
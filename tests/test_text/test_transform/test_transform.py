@@ -1,5 +1,100 @@
-from text.transform import replace_many
+from text.transform import (
+    replace_many,
+    replace_many_cache_clear,
+    replace_many_cache_info,
+    replace_many_stream,
+    replace_many_batch,
+    iter_replace_many_batch,
+    Replacer,
+)
+from text.transform.__contents import _ReplacerCache
+from pytest import raises
+import io
 
 
 def test_replace_many():
     assert replace_many("foo fo", dict(fo="ba", foo="bar")) == "bar ba"
+
+
+def test_replace_many_aho_corasick():
+    mapping = {"fo": "ba", "foo": "bar", "oof": "X", "of": "Y"}
+    for text in ("foo fo", "foofoof", "ooof", "Foo FO", ""):
+        for ignore_case in (False, True):
+            assert replace_many(
+                text, mapping, ignore_case=ignore_case, engine="aho-corasick"
+            ) == replace_many(text, mapping, ignore_case=ignore_case)
+
+    with raises(ValueError):
+        replace_many("foo", {"": "x"}, engine="aho-corasick")
+    with raises(ValueError):
+        replace_many("foo", mapping, engine="trie")  # type: ignore
+
+
+def test_replacer():
+    for engine in ("regex", "aho-corasick"):
+        redact = Replacer({"password": "***", "Token": "***"}, ignore_case=True, engine=engine)
+        assert redact("Password: x, TOKEN: y") == "***: x, ***: y"
+        assert redact.count("password, passwords, tok") == 2
+        assert list(redact.sub_many(["token", "none"])) == ["***", "none"]
+    assert Replacer({})("text") == "text" and Replacer({}).count("text") == 0
+
+
+def test_replace_many_cache():
+    replace_many_cache_clear()
+    for _ in range(3):
+        replace_many("foo fo", dict(fo="ba", foo="bar"))
+    info = replace_many_cache_info()
+    assert (info.hits, info.misses, info.currsize, info.keys) == (2, 1, 1, 2)
+
+    mapping = {"a": "b"}
+    assert replace_many("ab", mapping) == "bb"
+    mapping["b"] = "c"
+    assert replace_many("ab", mapping) == "bc"
+    assert replace_many_cache_info().misses == 3
+
+
+def test_replacer_cache_bounded_by_keys():
+    cache = _ReplacerCache(max_keys=3)
+    small, large = {"a": "1"}, {"b": "2", "c": "3"}
+    assert cache.get(small, False, "regex") is cache.get(small, False, "regex")
+    cache.get(large, False, "regex")
+    assert (cache.info().currsize, cache.info().keys) == (2, 3)
+    cache.get({"d": "4"}, False, "aho-corasick")
+    assert (cache.info().currsize, cache.info().keys) == (2, 3)
+    assert cache.get(small, False, "regex")("a") == "1"
+    assert cache.info().misses == 4
+
+
+def test_replace_many_stream():
+    mapping = {"secret": "***", "sec": "S", "token": "#"}
+    text = "a secret, a sec, a secre" + "t token" * 3
+    for engine in ("regex", "aho-corasick"):
+        for chunk_size in (1, 4, 7, 100):
+            sink = io.StringIO()
+            count = replace_many_stream(
+                io.StringIO(text), sink, mapping, engine=engine, chunk_size=chunk_size
+            )
+            assert sink.getvalue() == replace_many(text, mapping)
+            assert count == Replacer(mapping).count(text) == 6
+
+        data = text.encode()
+        chunks = [memoryview(data)[i : i + 5] for i in range(0, len(data), 5)]
+        sink = io.BytesIO()
+        replacer = Replacer({b"SECRET": b"***"}, ignore_case=True, engine=engine)
+        assert replacer.stream(chunks, sink) == 2
+        assert sink.getvalue() == replacer(data) == data.replace(b"secret", b"***")
+
+
+def test_replace_many_batch():
+    texts = [f"record {i}: secret" if i % 3 else f"Record {i}" for i in range(50)]
+    mapping = {"secret": "***", "record": "#"}
+    expect = [replace_many(text, mapping, ignore_case=True) for text in texts]
+    for workers in (1, 2):
+        assert (
+            replace_many_batch(texts, mapping, ignore_case=True, workers=workers, chunksize=7)
+            == expect
+        )
+    assert list(iter_replace_many_batch(iter(texts), mapping, ignore_case=True, workers=2)) == expect
+    assert replace_many_batch([], mapping, workers=2) == []
+    with raises(ValueError, match="engine"):
+        replace_many_batch(texts, mapping, engine="sed", workers=2)  # type: ignore
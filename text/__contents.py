@@ -1,25 +1,52 @@
-from operator import itemgetter as _itemgetter
-from ._utils import Trie as _Trie, suffix_array as _suffix_array
+from ._utils import (
+    Trie as _Trie,
+    sharded_prefixes_by_occurences as _sharded_prefixes_by_occurences,
+    ConcurrentTrie,
+    StreamingPrefixCounter,
+    suffix_array as _suffix_array,
+    SuffixArrayEngine as _SuffixArrayEngine,
+    generalized_suffix_array as _generalized_suffix_array,
+    lcp_intervals as _lcp_intervals,
+    estimate_suffix_array_memory,
+)
+from ._suffix_index import SuffixIndex
+from .transform.case_conversion import word_bounds as _word_bounds
+from ._frozen_trie import FrozenTrie
+from ._front_coding import FrontCodedStringSet
+from ._binary import SerializedFormatError
+from ._affixes import (
+    common_prefix as _common_prefix,
+    common_prefix_length as _common_prefix_length,
+    common_suffix as _common_suffix,
+)
 from typing import (
-    Generator as _Generator,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
     Union as _Union,
     Optional as _Optional,
     Literal as _Literal,
     Callable as _Callable,
     overload as _overload,
 )
-import re as _re
 from itertools import takewhile as _takewhile
+from collections import deque as _deque
+import heapq as _heapq
 
 
 def reverse_text(text: str, /) -> str:
     return "".join(reversed(text))
 
 
-def split_camel_case(text: str, /) -> str:
-    camelcase_group_pattern = _re.compile(r"(^[^A-Z]+|[A-Z_]+(?![^A-Z])|[A-Z][^A-Z_]+)")
-    cc_groups = (m.group(0) for m in camelcase_group_pattern.finditer(text))
-    return "".join(cc_groups)
+def split_camel_case(text: str, /, sep: str = "") -> str:
+    """
+    Words of camelCase identifier `text` joined with `sep`, see
+    `transform.case_conversion.word_bounds`.
+
+    >>> split_camel_case("parseHTTPRequest", " ")
+    'parse HTTP Request'
+    """
+    bounds = _word_bounds(text)
+    return sep.join([text[start:stop] for start, stop in zip(bounds, bounds[1:])])
 
 
 Prefix = str
@@ -31,7 +58,7 @@ PrefixesWithOccurences = list[tuple[Prefix, Occurences]]
 
 @_overload
 def prefixes_by_occurences(
-    *strings: str, min_len: int = 1, ascending_order: bool = False
+    *strings: str, min_len: int = 1, ascending_order: bool = False, workers: _Optional[int] = None
 ) -> Prefixes:
     ...
 
@@ -42,57 +69,117 @@ def prefixes_by_occurences(
     with_occurences: _Literal[False],
     min_len: int = 1,
     ascending_order: bool = False,
+    workers: _Optional[int] = None,
 ) -> Prefixes:
     ...
 
 
 @_overload
 def prefixes_by_occurences(
-    *strings: str, with_occurences: _Literal[True], min_len: int = 1, ascending_order: bool = False
+    *strings: str,
+    with_occurences: _Literal[True],
+    min_len: int = 1,
+    ascending_order: bool = False,
+    workers: _Optional[int] = None,
 ) -> PrefixesWithOccurences:
     ...
 
 
 def prefixes_by_occurences(
-    *strings: str, with_occurences: bool = False, min_len: int = 1, ascending_order: bool = False
+    *strings: str,
+    with_occurences: bool = False,
+    min_len: int = 1,
+    ascending_order: bool = False,
+    workers: _Optional[int] = None,
 ) -> _Union[Prefixes, PrefixesWithOccurences]:
-    trie = _Trie()
-    trie.insert(*strings)
-    prefixes_with_occurences = trie.getPrefixesByOccurences(
-        min_len=min_len, ascending_order=ascending_order
-    )
+    """
+    Prefixes of `strings` sorted by the number of strings starting with them.
+
+    With `workers` given, the strings are counted in that many processes, see
+    `text._utils.sharded_prefixes_by_occurences`.
+    """
+    if workers is None:
+        trie = _Trie()
+        trie.insert(*strings)
+        prefixes_with_occurences = trie.getPrefixesByOccurences(
+            min_len=min_len, ascending_order=ascending_order
+        )
+    else:
+        prefixes_with_occurences = _sharded_prefixes_by_occurences(
+            strings, min_len=min_len, ascending_order=ascending_order, workers=workers
+        )
     if with_occurences:
         return prefixes_with_occurences
 
     return [prefix for prefix, _ in prefixes_with_occurences]
 
 
-def longest_common_prefix(*strings: str) -> _Optional[str]:
-    (most_common_prefix, occurences), *_ = prefixes_by_occurences(*strings, with_occurences=True)
-    return most_common_prefix if occurences == len(strings) else None
+def streamed_prefixes_by_occurences(
+    strings: _Iterable[str],
+    /,
+    *,
+    max_nodes: int,
+    min_len: int = 1,
+    ascending_order: bool = False,
+) -> list[tuple[Prefix, Occurences, int]]:
+    """
+    Streaming counterpart of `prefixes_by_occurences` for inputs too big to keep in memory.
 
+    `strings` is consumed lazily (e.g. lines of a log file) into a trie of at most `max_nodes`
+    nodes, see `StreamingPrefixCounter`. Returns `(prefix, occurences, error)` triples, where
+    the true number of occurences is in range [`occurences`, `occurences + error`].
+    """
+    counter = StreamingPrefixCounter(max_nodes)
+    counter.update(strings)
+    return counter.prefixes_by_occurences(min_len=min_len, ascending_order=ascending_order)
 
-def shortest_common_prefix(*strings: str, min_len: int = 1) -> _Optional[str]:
-    (most_common_prefix, occurences), *_ = prefixes_by_occurences(
-        *strings, with_occurences=True, min_len=min_len, ascending_order=True
-    )
-    return most_common_prefix if occurences == len(strings) else None
 
+def _strings_of(args: tuple) -> _Iterable[str]:
+    """
+    `*strings` arguments, or the single iterable of strings passed instead of them.
+    """
+    if len(args) == 1 and not isinstance(args[0], str):
+        return args[0]
+    return args
 
-def longest_common_suffix(*strings: str) -> _Optional[str]:
-    return (
-        reverse_text(lcs)
-        if (lcs := longest_common_prefix(*map(reverse_text, strings))) is not None
-        else None
-    )
+
+def longest_common_prefix(*strings: _Union[str, _Iterable[str]]) -> _Optional[str]:
+    """
+    Longest prefix shared by all `strings` (passed as arguments or as one iterable),
+    `None` if they do not share any.
+    """
+    return _common_prefix(_strings_of(strings)) or None
+
+
+def shortest_common_prefix(
+    *strings: _Union[str, _Iterable[str]], min_len: int = 1
+) -> _Optional[str]:
+    """
+    Shortest prefix at least `min_len` long shared by all `strings` (passed as arguments or as
+    one iterable), `None` if they do not share any.
+    """
+    prefix = _common_prefix(_strings_of(strings))
+    return prefix[:min_len] if prefix is not None and len(prefix) >= min_len else None
 
 
-def shortest_common_suffix(*strings: str, min_len: int = 1) -> _Optional[str]:
+def longest_common_suffix(*strings: _Union[str, _Iterable[str]]) -> _Optional[str]:
+    """
+    Longest suffix shared by all `strings` (passed as arguments or as one iterable),
+    `None` if they do not share any.
+    """
+    return _common_suffix(_strings_of(strings)) or None
+
+
+def shortest_common_suffix(
+    *strings: _Union[str, _Iterable[str]], min_len: int = 1
+) -> _Optional[str]:
+    """
+    Shortest suffix at least `min_len` long shared by all `strings` (passed as arguments or as
+    one iterable), `None` if they do not share any.
+    """
+    suffix = _common_suffix(_strings_of(strings))
     return (
-        reverse_text(scs)
-        if (scs := shortest_common_prefix(*map(reverse_text, strings), min_len=min_len))
-        is not None
-        else None
+        suffix[len(suffix) - min_len :] if suffix is not None and len(suffix) >= min_len else None
     )
 
 
@@ -133,60 +220,80 @@ def longest_common_suffixes(*strings: str, min_len: int = 1) -> list[str]:
 PrefixGroup = _Union[Prefix, list["PrefixGroup"]]
 
 
-# TODO test
-def groups_by_prefixes(*strings, min_len: int = 1) -> list[PrefixGroup]:
-    strings = sorted(strings)
-    prev_prefix_lengths = len(strings) * [0]
-    max_str_len = max(len(s) for s in strings)
-
-    def _groups_by_prefixes(
-        *strings: str, prev_prefix_lengths: list[int], max_str_len: int
-    ) -> _Generator[PrefixGroup, None, None]:
-        while True:
-            new_prev_prefix_lengths = len(strings) * [0]
-            for ppl_ix, (prefix, prev_prefix_len) in enumerate(
-                zip(
-                    sorted(longest_common_prefixes(*strings, min_len=min_len), key=_itemgetter(0)),
-                    prev_prefix_lengths,
-                )
-            ):
-                starts_with_prefix: _Callable[[str], bool] = lambda s: s.startswith(
-                    prefix, prev_prefix_len
-                )
-                strings_starting_with_prefix = list(_takewhile(starts_with_prefix, strings))
-
-                if not strings_starting_with_prefix:
-                    yield prefix
-
-                else:
-                    yield list(
-                        reversed(
-                            [
-                                *_groups_by_prefixes(
-                                    *strings,
-                                    prev_prefix_lengths=prev_prefix_lengths,
-                                    max_str_len=max_str_len,
-                                )
-                            ]
-                        )
-                    )
-
-                new_prev_prefix_lengths[ppl_ix] = len(prefix)
-
-            if all(nppl > max_str_len for nppl in new_prev_prefix_lengths):
-                return
-
-            prev_prefix_lengths = new_prev_prefix_lengths
-
-    return [
-        pg
-        for pg in _groups_by_prefixes(
-            *strings, prev_prefix_lengths=prev_prefix_lengths, max_str_len=max_str_len
+def groups_by_prefixes(*strings: str, min_len: int = 1) -> list[PrefixGroup]:
+    """
+    Nests `strings` (deduplicated and sorted) by their common prefixes at least `min_len` long.
+
+    Every group is a list of its common prefix followed by its members - strings and subgroups
+    with longer prefixes. Strings not sharing such a prefix with any other are left ungrouped.
+
+    >>> groups_by_prefixes("file_1", "file_2", "not_a_file_1", "not_a_file_2", "x", min_len=2)
+    [['file_', 'file_1', 'file_2'], ['not_a_file_', 'not_a_file_1', 'not_a_file_2'], 'x']
+
+    The groups are the branching nodes of the radix tree of `strings`, see
+    `iter_groups_by_prefixes`.
+    """
+    return list(iter_groups_by_prefixes(sorted(strings), min_len=min_len, presorted=True))
+
+
+def iter_groups_by_prefixes(
+    strings: _Iterable[str], /, *, min_len: int = 1, presorted: bool = False
+) -> _Iterator[PrefixGroup]:
+    """
+    Top-level items of `groups_by_prefixes(*strings, min_len=min_len)`, each yielded as soon as
+    it is complete.
+
+    The radix tree is built in one pass over the sorted strings: the common prefix of every
+    pair of neighbours tells how many open groups end and whether a new one starts, so it takes
+    O(total length) after sorting. With `presorted=True` the strings are not sorted (which
+    raises `ValueError` if they are not) and only the open groups are kept in memory.
+    """
+    if not presorted:
+        strings = sorted(strings)
+
+    # open groups (prefix length, members), the root is never closed
+    stack: list[tuple[int, list[PrefixGroup]]] = [(0, [])]
+    root = stack[0][1]
+    prev: _Optional[str] = None
+    for string in strings:
+        if prev is not None:
+            if string == prev:
+                continue
+            if string < prev:
+                raise ValueError(f"strings are not sorted: {prev!r} > {string!r}")
+
+        lcp = 0 if prev is None else _common_prefix_length(prev, string)
+        closed: _Optional[list[PrefixGroup]] = None
+        while lcp < stack[-1][0]:
+            length, members = stack.pop()
+            # groups with too short prefixes are flattened into their parents
+            closed = [[prev[:length], *members]] if length >= min_len else members  # type: ignore
+            if lcp <= stack[-1][0]:
+                stack[-1][1].extend(closed)
+                closed = None
+
+        if lcp > stack[-1][0]:
+            # `string` branches off below the previous string (or the group just closed)
+            stack.append((lcp, closed if closed is not None else [stack[-1][1].pop()]))
+        stack[-1][1].append(string)
+        prev = string
+
+        # the last top-level item may still move into a new group
+        if len(root) > 1:
+            yield from root[:-1]
+            del root[:-1]
+
+    while len(stack) > 1:
+        length, members = stack.pop()
+        stack[-1][1].extend(
+            [[prev[:length], *members]] if length >= min_len else members  # type: ignore
         )
-    ]
+    yield from root
 
 
-def longest_common_substring(text: str) -> dict[str, list[int]]:
+def longest_common_substring(
+    text: str, *, engine: _SuffixArrayEngine = "doubling"
+) -> dict[str, list[int]]:
     """Get the longest common substrings and their positions.
     >>> longest_common_substring('banana')
     {'ana': [1, 3]}
@@ -195,8 +302,10 @@ def longest_common_substring(text: str) -> dict[str, list[int]]:
     [(' s', [3, 21]), ('no', [0, 13]), ('o ', [5, 20, 38])]
     This function can be easy modified for any criteria, e.g. for searching ten
     longest non overlapping repeated substrings.
+
+    `engine` selects the suffix array construction algorithm (see `text._utils.suffix_array`).
     """
-    suffix_array, _, longest_common_prefixes = _suffix_array(text)
+    suffix_array, _, longest_common_prefixes = _suffix_array(text, engine=engine)
     max_len = max(longest_common_prefixes)  # type: ignore
     result = {}
     for i in range(1, len(text)):
@@ -208,3 +317,145 @@ def longest_common_substring(text: str) -> dict[str, list[int]]:
                 result[substring] = [j1]
             result[substring].append(j2)
     return dict((k, sorted(v)) for k, v in result.items())
+
+
+Match = tuple[int, int]
+
+
+def longest_common_substring_among(
+    *texts: str, k: _Optional[int] = None
+) -> dict[str, list[Match]]:
+    """Get the longest substrings shared by at least `k` (all by default) of `texts`.
+
+    Positions are `(text index, offset)` pairs. All the texts are analyzed together in a single
+    generalized suffix array, so the cost is near-linear in their total length instead of
+    quadratic in their number.
+    >>> longest_common_substring_among("banana", "ananas", "cabana")
+    {'ana': [(0, 1), (0, 3), (1, 0), (1, 2), (2, 3)]}
+    >>> longest_common_substring_among("banana", "ananas", "cabana", k=2)
+    {'anana': [(0, 1), (1, 0)]}
+
+    Raises
+    ------
+    `ValueError` if `k` is not in range [2, `len(texts)`]
+    """
+    if k is None:
+        k = len(texts)
+
+    if not 2 <= k <= len(texts):
+        raise ValueError(f"expected `k` in range [2, {len(texts)}], got {k}")
+
+    sa, lcp, docs, starts = _generalized_suffix_array(texts)
+    n_texts, size = len(texts), len(sa)
+
+    # sliding window over suffix array ranks with at least `k` distinct texts,
+    # the separators (first `n_texts` ranks) are skipped
+    counts = n_texts * [0]
+    distinct = 0
+    window_min: _deque[int] = _deque()  # ranks in (left, right] with increasing LCP values
+    left = n_texts
+    max_len = 0
+    for right in range(n_texts, size):
+        doc = docs[sa[right]]
+        distinct += counts[doc] == 0
+        counts[doc] += 1
+        if right > left:
+            while window_min and lcp[window_min[-1]] >= lcp[right]:
+                window_min.pop()
+            window_min.append(right)
+
+        while distinct >= k:
+            max_len = max(max_len, lcp[window_min[0]])
+            doc = docs[sa[left]]
+            counts[doc] -= 1
+            distinct -= counts[doc] == 0
+            left += 1
+            if window_min and window_min[0] <= left:
+                window_min.popleft()
+
+    if max_len == 0:
+        return {}
+
+    def match(rank: int) -> Match:
+        doc = docs[sa[rank]]
+        return doc, sa[rank] - starts[doc]
+
+    # ranks of suffixes sharing the first `max_len` characters form runs of LCP >= `max_len`
+    result = {}
+    run_start = n_texts
+    for rank in range(n_texts + 1, size + 1):
+        if rank < size and lcp[rank] >= max_len:
+            continue
+
+        if len({docs[sa[r]] for r in range(run_start, rank)}) >= k:
+            doc, offset = match(run_start)
+            result[texts[doc][offset : offset + max_len]] = sorted(
+                map(match, range(run_start, rank))
+            )
+        run_start = rank
+
+    return result
+
+
+def repeated_substrings(
+    text: str,
+    /,
+    k: _Optional[int] = None,
+    *,
+    min_len: int = 1,
+    non_overlapping: bool = False,
+    engine: _SuffixArrayEngine = "sais",
+) -> _Iterator[tuple[str, list[int]]]:
+    """Yield repeated substrings and their positions from the longest ones.
+
+    Reported are the substrings occuring at least twice that cannot be extended to the right
+    without losing an occurence, at most `k` of them (all by default) and at least `min_len`
+    characters long. Equally long substrings are yielded in lexicographic order.
+    >>> list(repeated_substrings("banana"))
+    [('ana', [1, 3]), ('na', [2, 4]), ('a', [1, 3, 5])]
+    >>> list(repeated_substrings("banana", 2, non_overlapping=True))
+    [('an', [1, 3]), ('na', [2, 4])]
+
+    With `non_overlapping=True` a substring is shortened to fit between its first and last
+    occurences and the positions are chosen greedily so that the occurences do not overlap.
+
+    The candidates are the LCP intervals of the suffix array kept as integers, only the yielded
+    substrings are sliced out of `text`. With `k` given they are selected with a bounded heap.
+    """
+    sa, _, lcp = _suffix_array(text, engine=engine)
+
+    candidates = (
+        (length, interval.start, interval.stop)
+        for interval in _lcp_intervals(sa, lcp)
+        if (
+            length := min(interval.lcp, interval.last - interval.first)
+            if non_overlapping
+            else interval.lcp
+        )
+        > interval.parent_lcp
+        and length >= min_len
+    )
+
+    def popped(heap: list[tuple[int, int, int]]) -> _Iterator[tuple[int, int, int]]:
+        _heapq.heapify(heap)
+        while heap:
+            negative_length, start, stop = _heapq.heappop(heap)
+            yield -negative_length, start, stop
+
+    selected = (
+        _heapq.nlargest(k, candidates, key=lambda c: (c[0], -c[1]))
+        if k is not None
+        else popped([(-length, start, stop) for length, start, stop in candidates])
+    )
+
+    for length, start, stop in selected:
+        positions = sorted(sa[start:stop])
+        if non_overlapping:
+            chosen, end = [], 0
+            for pos in positions:
+                if pos >= end:
+                    chosen.append(pos)
+                    end = pos + length
+            positions = chosen
+
+        yield text[positions[0] : positions[0] + length], positions
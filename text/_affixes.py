@@ -0,0 +1,93 @@
+from typing import (
+    Annotated as _Annotated,
+    Iterable as _Iterable,
+    Optional as _Optional,
+)
+
+
+_Natural = _Annotated[int, ">= 0"]
+
+
+def common_prefix_length(a: str, b: str, /, start: _Natural = 0) -> _Natural:
+    """
+    Length of the longest common prefix of `a` and `b`, given that the first `start`
+    characters are known to be equal.
+
+    Binary search over `str.startswith` - the compared slices halve every step, so at most
+    O(len) characters are copied and compared, at C speed.
+    """
+    lo, hi = start, min(len(a), len(b))
+    if b.startswith(a[lo:hi], lo):
+        return hi
+
+    # invariant: a[:lo] == b[:lo] and a[:hi + 1] != b[:hi + 1]
+    hi -= 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if b.startswith(a[lo:mid], lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_suffix_length(a: str, b: str, /, start: _Natural = 0) -> _Natural:
+    """
+    Length of the longest common suffix of `a` and `b`, given that the last `start`
+    characters are known to be equal. See `common_prefix_length`.
+    """
+    len_a, len_b = len(a), len(b)
+    lo, hi = start, min(len_a, len_b)
+    if b.endswith(a[len_a - hi : len_a - lo], 0, len_b - lo):
+        return hi
+
+    hi -= 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if b.endswith(a[len_a - mid : len_a - lo], 0, len_b - lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def common_prefix(strings: _Iterable[str], /) -> _Optional[str]:
+    """
+    Longest prefix shared by all `strings` (`None` if there are none).
+
+    It is the common prefix of the lexicographically smallest and greatest string, found in a
+    single pass over `strings` (which can be any iterable, e.g. a generator).
+    """
+    iterator = iter(strings)
+    smallest = greatest = next(iterator, None)
+    if smallest is None:
+        return None
+
+    for string in iterator:
+        if string < smallest:
+            smallest = string
+        elif string > greatest:  # type: ignore
+            greatest = string
+
+    return smallest[: common_prefix_length(smallest, greatest)]  # type: ignore
+
+
+def common_suffix(strings: _Iterable[str], /) -> _Optional[str]:
+    """
+    Longest suffix shared by all `strings` (`None` if there are none).
+
+    The strings are compared from the end in place (no reversed copies), the current common
+    suffix only shrinks, so the whole scan is O(total length).
+    """
+    iterator = iter(strings)
+    suffix = next(iterator, None)
+    if suffix is None:
+        return None
+
+    for string in iterator:
+        if not suffix:
+            break
+        if not string.endswith(suffix):
+            suffix = suffix[len(suffix) - common_suffix_length(suffix, string) :]
+
+    return suffix
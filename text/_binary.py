@@ -0,0 +1,187 @@
+"""
+Minimal container format for persisting flat integer arrays, shared by the on-disk indices of
+the `text` package.
+
+Layout (header fields little-endian, array items in native byte order):
+
+    magic: 4s | version: H | byteorder: c ("<" or ">") | pad | array count: I | crc32: I
+    array count * (typecode: c | pad: 7x | length: Q)
+    payload: arrays one after another, each aligned to 8 bytes
+
+`crc32` covers the whole payload. Arrays are read back as `memoryview`s cast to their typecode,
+so mapping a file with `mmap` gives zero-copy access.
+"""
+
+from array import array
+from io import BytesIO
+from mmap import mmap, ACCESS_READ
+from os import PathLike
+from sys import byteorder
+from typing import BinaryIO, Optional, Sequence, TypeVar, Union
+import struct
+import zlib
+
+
+_HEADER = struct.Struct("<4sHcxII")
+_ARRAY = struct.Struct("<c7xQ")
+_ALIGNMENT = 8
+_TYPECODES = "bBhHiIlLqQ"
+_BYTEORDER = b"<" if byteorder == "little" else b">"
+
+Path = Union[str, "PathLike[str]"]
+Buffer = Union[bytes, bytearray, memoryview, mmap, array]
+
+_Mapped = TypeVar("_Mapped", bound="MappedFile")
+
+
+class SerializedFormatError(ValueError):
+    """
+    Serialized data is corrupted, truncated or written in an incompatible format
+    """
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % _ALIGNMENT)
+
+
+def _payload_crc(arrays: Sequence[memoryview]) -> int:
+    crc = 0
+    for view in arrays:
+        crc = zlib.crc32(view, crc)
+        crc = zlib.crc32(_padding(view.nbytes), crc)
+    return crc
+
+
+def write_arrays(
+    file: Union[Path, BinaryIO], magic: bytes, version: int, arrays: Sequence[Buffer]
+) -> None:
+    """
+    Writes `arrays` (`array.array`s or `memoryview`s with an integer format) to `file`.
+    """
+    views = [memoryview(arr) for arr in arrays]
+    header = _HEADER.pack(magic, version, _BYTEORDER, len(views), _payload_crc(views))
+
+    if not hasattr(file, "write"):
+        with open(file, "wb") as f:  # type: ignore
+            return write_arrays(f, magic, version, views)
+
+    file.write(header)  # type: ignore
+    for view in views:
+        file.write(_ARRAY.pack(view.format[-1].encode(), len(view)))  # type: ignore
+    for view in views:
+        file.write(view)  # type: ignore
+        file.write(_padding(view.nbytes))  # type: ignore
+
+
+def pack_arrays(magic: bytes, version: int, arrays: Sequence[Buffer]) -> bytes:
+    buffer = BytesIO()
+    write_arrays(buffer, magic, version, arrays)
+    return buffer.getvalue()
+
+
+def unpack_arrays(
+    buffer: Buffer, magic: bytes, version: int, *, verify: bool = True
+) -> list[memoryview]:
+    """
+    Returns zero-copy views of the arrays stored in `buffer`.
+
+    Raises
+    ------
+    `SerializedFormatError`(`ValueError`) if `buffer` is not a valid container written with
+    `magic` and `version` on a machine of the same byte order, or (if `verify`) its checksum
+    does not match.
+    """
+    with memoryview(buffer) as root, root.cast("B") as view:
+        return _unpacked(view, magic, version, verify=verify)
+
+
+def _unpacked(view: memoryview, magic: bytes, version: int, *, verify: bool) -> list[memoryview]:
+    if view.nbytes < _HEADER.size:
+        raise SerializedFormatError(f"expected at least {_HEADER.size} bytes, got {view.nbytes}")
+
+    found_magic, found_version, found_byteorder, count, crc = _HEADER.unpack_from(view)
+    if found_magic != magic:
+        raise SerializedFormatError(f"expected magic {magic!r}, got {found_magic!r}")
+    if found_version != version:
+        raise SerializedFormatError(f"expected format version {version}, got {found_version}")
+    if found_byteorder != _BYTEORDER:
+        raise SerializedFormatError(f"data written with byte order {found_byteorder!r}")
+
+    offset = _HEADER.size + count * _ARRAY.size
+    if view.nbytes < offset:
+        raise SerializedFormatError("truncated array table")
+
+    layout = []
+    for i in range(count):
+        typecode, length = _ARRAY.unpack_from(view, _HEADER.size + i * _ARRAY.size)
+        typecode = typecode.decode("latin-1")
+        if typecode not in _TYPECODES:
+            raise SerializedFormatError(f"unsupported array typecode {typecode!r}")
+        nbytes = length * array(typecode).itemsize
+        layout.append((typecode, offset, nbytes))
+        offset += nbytes + len(_padding(nbytes))
+
+    if view.nbytes < offset:
+        raise SerializedFormatError(f"expected {offset} bytes, got {view.nbytes}")
+
+    payload_start = _HEADER.size + count * _ARRAY.size
+    if verify and zlib.crc32(view[payload_start:offset]) != crc:
+        raise SerializedFormatError("checksum mismatch")
+
+    return [view[start : start + nbytes].cast(typecode) for typecode, start, nbytes in layout]
+
+
+def map_arrays(
+    path: Path, magic: bytes, version: int, *, verify: bool = True
+) -> tuple[mmap, list[memoryview]]:
+    """
+    Memory-maps `path` read-only and returns the map together with zero-copy array views.
+
+    All the views have to be released before the map is closed.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap(f.fileno(), 0, access=ACCESS_READ)
+
+    try:
+        return mapped, unpack_arrays(mapped, magic, version, verify=verify)
+    except BaseException:
+        mapped.close()
+        raise
+
+
+def unmap_arrays(mapped: mmap, views: Sequence[memoryview]) -> None:
+    """
+    Releases `views` and closes `mapped`, as returned by `map_arrays`.
+    """
+    for view in views:
+        view.release()
+    mapped.close()
+
+
+class MappedFile:
+    """
+    Mixin of the objects opened from a file by `map_arrays` (attached with `_attach`).
+    `close`, or leaving the `with` block the object is used in, unmaps the file.
+    """
+
+    _mmap: Optional[mmap] = None
+    _mapped_views: Sequence[memoryview] = ()
+
+    def _attach(self, mapped: mmap, views: Sequence[memoryview]) -> None:
+        self._mmap, self._mapped_views = mapped, views
+
+    def close(self) -> None:
+        """
+        Unmaps the file the object was loaded from, if it was.
+        """
+        if self._mmap is None:
+            return
+
+        unmap_arrays(self._mmap, self._mapped_views)
+        self._mmap, self._mapped_views = None, ()
+
+    def __enter__(self: _Mapped) -> _Mapped:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
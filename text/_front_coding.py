@@ -0,0 +1,215 @@
+from array import array as _array
+from bisect import bisect_left as _bisect_left
+from typing import (
+    Annotated as _Annotated,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    Union as _Union,
+)
+
+from ._affixes import common_prefix_length as _common_prefix_length
+from ._binary import (
+    Buffer as _Buffer,
+    SerializedFormatError,
+    pack_arrays as _pack_arrays,
+    unpack_arrays as _unpack_arrays,
+)
+
+
+_Natural = _Annotated[int, ">= 0"]
+_Bytes = _Union[bytes, bytearray, memoryview]
+
+_MAGIC = b"PYFC"
+_FORMAT_VERSION = 1
+
+
+def _write_varint(data: bytearray, value: _Natural) -> None:
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+
+def _read_varint(data: _Bytes, pos: _Natural) -> tuple[_Natural, _Natural]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class FrontCodedStringSet:
+    """
+    Sorted set of strings compressed by front coding.
+
+    Strings are UTF-8 encoded (which keeps their order) and split into blocks of `block_size`.
+    The first string of a block is stored whole, every next one as the length of the prefix it
+    shares with its predecessor and the rest of it, so long shared prefixes (paths, URLs) are
+    stored once per block. Lookups binary search the first strings of the blocks and decode
+    one block, which takes O(log n + block_size).
+
+    Examples
+    --------
+    >>> urls = FrontCodedStringSet(["https://a.io/x/1", "https://a.io/x/2", "https://b.io/"])
+    >>> "https://a.io/x/2" in urls
+    True
+    >>> urls.rank("https://b.io/"), urls[0]
+    (2, 'https://a.io/x/1')
+    >>> list(urls.iter_prefix("https://a.io/"))
+    ['https://a.io/x/1', 'https://a.io/x/2']
+
+    `to_bytes` serializes the set into the checksummed container of the `text` package,
+    `from_bytes` reads it back without copying - from a memory-mapped file as well.
+    """
+
+    def __init__(self, strings: _Iterable[str] = (), *, block_size: int = 16) -> None:
+        if block_size < 1:
+            raise ValueError(f"expected `block_size` >= 1, got {block_size}")
+
+        data = bytearray()
+        offsets = _array("q")
+        prev = b""
+        size = 0
+        for size, string in enumerate(sorted(set(strings)), 1):
+            encoded = string.encode()
+            if (size - 1) % block_size == 0:
+                offsets.append(len(data))
+                _write_varint(data, len(encoded))
+                data += encoded
+            else:
+                shared = _common_prefix_length(prev, encoded)  # type: ignore
+                _write_varint(data, shared)
+                _write_varint(data, len(encoded) - shared)
+                data += encoded[shared:]
+            prev = encoded
+
+        self._data: _Bytes = data
+        self._offsets = offsets
+        self._len = size
+        self._block_size = block_size
+
+    def to_bytes(self) -> bytes:
+        meta = _array("q", [self._len, self._block_size])
+        return _pack_arrays(_MAGIC, _FORMAT_VERSION, [meta, self._offsets, self._data])
+
+    @classmethod
+    def from_bytes(cls, buffer: _Buffer, *, verify: bool = True) -> "FrontCodedStringSet":
+        """
+        Zero-copy view of a set serialized by `FrontCodedStringSet.to_bytes` (`buffer` must not
+        change while the set is used).
+
+        Raises
+        ------
+        `SerializedFormatError`(`ValueError`) if `buffer` does not hold a valid set.
+        """
+        arrays = _unpack_arrays(buffer, _MAGIC, _FORMAT_VERSION, verify=verify)
+        if len(arrays) != 3:
+            raise SerializedFormatError(f"expected 3 arrays, got {len(arrays)}")
+
+        meta, offsets, data = arrays
+        size, block_size = meta
+        if len(offsets) != -(-size // block_size):
+            raise SerializedFormatError("inconsistent block count")
+
+        string_set = cls.__new__(cls)
+        string_set._data = data
+        string_set._offsets = offsets
+        string_set._len = size
+        string_set._block_size = block_size
+        return string_set
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size
+
+    def __len__(self) -> _Natural:
+        return self._len
+
+    def __contains__(self, string: str) -> bool:
+        key = string.encode()
+        block = self._find_block(key)
+        if block < 0:
+            return False
+
+        entries = self._block(block)
+        index = _bisect_left(entries, key)
+        return index < len(entries) and entries[index] == key
+
+    def __getitem__(self, index: int) -> str:
+        """
+        The `index`-th smallest string (select).
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("FrontCodedStringSet index out of range")
+
+        block, offset = divmod(index, self._block_size)
+        return self._block(block)[offset].decode()
+
+    def __iter__(self) -> _Iterator[str]:
+        return self._iter_from(0)
+
+    def rank(self, string: str) -> _Natural:
+        """
+        Number of strings in the set smaller than `string`.
+        """
+        key = string.encode()
+        block = self._find_block(key)
+        if block < 0:
+            return 0
+        return block * self._block_size + _bisect_left(self._block(block), key)
+
+    def iter_prefix(self, prefix: str) -> _Iterator[str]:
+        """
+        Strings starting with `prefix` in sorted order.
+        """
+        key = prefix.encode()
+        for string in self._iter_from(self.rank(prefix)):
+            if not string.encode().startswith(key):
+                return
+            yield string
+
+    def _first(self, block: int) -> bytes:
+        length, pos = _read_varint(self._data, self._offsets[block])
+        return bytes(self._data[pos : pos + length])
+
+    def _find_block(self, key: bytes) -> int:
+        """
+        Last block whose first string is not greater than `key` (`-1` if there is none).
+        """
+        lo, hi = 0, len(self._offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._first(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def _block(self, block: int) -> list[bytes]:
+        data = self._data
+        pos = self._offsets[block]
+        count = min(self._block_size, self._len - block * self._block_size)
+
+        length, pos = _read_varint(data, pos)
+        string = bytes(data[pos : pos + length])
+        pos += length
+        entries = [string]
+        for _ in range(count - 1):
+            shared, pos = _read_varint(data, pos)
+            length, pos = _read_varint(data, pos)
+            string = string[:shared] + data[pos : pos + length]
+            pos += length
+            entries.append(string)
+        return entries
+
+    def _iter_from(self, index: _Natural) -> _Iterator[str]:
+        block, offset = divmod(index, self._block_size)
+        for block in range(block, len(self._offsets)):
+            for entry in self._block(block)[offset:]:
+                yield entry.decode()
+            offset = 0
@@ -0,0 +1,184 @@
+from array import array as _array
+from bisect import bisect_left as _bisect_left
+from typing import (
+    Annotated as _Annotated,
+    Optional as _Optional,
+    Sequence as _Sequence,
+)
+
+from ._binary import (
+    Buffer as _Buffer,
+    MappedFile as _MappedFile,
+    Path as _Path,
+    SerializedFormatError,
+    map_arrays as _map_arrays,
+    pack_arrays as _pack_arrays,
+    unmap_arrays as _unmap_arrays,
+    unpack_arrays as _unpack_arrays,
+    write_arrays as _write_arrays,
+)
+from ._utils import Trie as _Trie, _index_typecode
+
+
+_Natural = _Annotated[int, ">= 0"]
+
+_MAGIC = b"PYFT"
+_FORMAT_VERSION = 1
+
+
+class FrozenTrie(_MappedFile):
+    """
+    Read-only `Trie` in a flat layout, which is queried directly from a (memory-mapped) buffer.
+
+    Nodes are numbered in level order (breadth-first, children by character), so the children
+    of every node are contiguous: node `i` is described by the i-th items of the edge
+    character, prefix count and string count arrays, and its children are the nodes
+    `child_starts[i]:child_starts[i + 1]`, sorted by character and found by binary search.
+    This is the LOUDS layout with the select results stored instead of the bit vector -
+    a pure Python rank/select would make every step of a lookup several times slower.
+
+    Examples
+    --------
+    >>> trie = Trie()
+    >>> trie.insert("file_1", "file_2", "not_a_file_1")
+    >>> FrozenTrie.from_trie(trie).save("names.trie")  # doctest: +SKIP
+    >>> with FrozenTrie.load("names.trie") as frozen:  # doctest: +SKIP
+    ...     frozen.prefix_count("file_")
+    2
+
+    The file written by `save` is memory-mapped by `load` the same way as a `SuffixIndex` file.
+    """
+
+    def __init__(
+        self,
+        chars: _Sequence[int],
+        counts: _Sequence[int],
+        ends: _Sequence[int],
+        child_starts: _Sequence[int],
+    ) -> None:
+        if not len(chars) == len(counts) == len(ends) == len(child_starts) - 1 > 0:
+            raise ValueError("inconsistent node array lengths")
+
+        self._chars = chars
+        self._counts = counts
+        self._ends = ends
+        self._child_starts = child_starts
+
+    @classmethod
+    def from_trie(cls, trie: _Trie) -> "FrozenTrie":
+        trie_chars, trie_counts, trie_ends = trie._chars, trie._counts, trie._ends
+        # the root counts every string, so its count bounds all counts and string counts
+        count_typecode = _index_typecode(trie_counts[_Trie._ROOT])
+        chars, counts, ends = _array("I"), _array(count_typecode), _array(count_typecode)
+        child_starts = _array(_index_typecode(len(trie) + 1))
+
+        order = [_Trie._ROOT]
+        for node in order:
+            chars.append(trie_chars[node])
+            counts.append(trie_counts[node])
+            ends.append(trie_ends[node])
+            child_starts.append(len(order))
+            order.extend(sorted(trie._children(node), key=trie_chars.__getitem__))
+        child_starts.append(len(order))
+
+        chars[0] = 0
+        return cls(chars, counts, ends, child_starts)
+
+    def _arrays(self) -> list:
+        return [self._chars, self._counts, self._ends, self._child_starts]
+
+    def save(self, path: _Path) -> None:
+        """
+        Writes the trie to `path`, see `FrozenTrie.load`.
+        """
+        _write_arrays(path, _MAGIC, _FORMAT_VERSION, self._arrays())
+
+    def to_bytes(self) -> bytes:
+        return _pack_arrays(_MAGIC, _FORMAT_VERSION, self._arrays())
+
+    @classmethod
+    def from_bytes(cls, buffer: _Buffer, *, verify: bool = True) -> "FrozenTrie":
+        """
+        Zero-copy view of a trie serialized by `FrozenTrie.to_bytes` (`buffer` must not change
+        while the trie is used).
+        """
+        return cls(*cls._checked(_unpack_arrays(buffer, _MAGIC, _FORMAT_VERSION, verify=verify)))
+
+    @classmethod
+    def load(cls, path: _Path, *, verify: bool = True) -> "FrozenTrie":
+        """
+        Opens a trie written by `FrozenTrie.save` without copying it into memory. The file stays
+        mapped until `close` is called (or the `with` block it is used in exits).
+
+        Raises
+        ------
+        `SerializedFormatError`(`ValueError`) if the file is not a valid trie.
+        """
+        mapped, arrays = _map_arrays(path, _MAGIC, _FORMAT_VERSION, verify=verify)
+        try:
+            trie = cls(*cls._checked(arrays))
+        except BaseException:
+            _unmap_arrays(mapped, arrays)
+            raise
+
+        trie._attach(mapped, arrays)
+        return trie
+
+    @staticmethod
+    def _checked(arrays: list[memoryview]) -> list[memoryview]:
+        if len(arrays) != 4:
+            raise SerializedFormatError(f"expected 4 arrays, got {len(arrays)}")
+
+        chars, counts, ends, child_starts = arrays
+        if not len(chars) == len(counts) == len(ends) == len(child_starts) - 1 > 0:
+            raise SerializedFormatError("inconsistent node array lengths")
+        return arrays
+
+    def __len__(self) -> _Natural:
+        """
+        Number of nodes, including the root.
+        """
+        return len(self._chars)
+
+    def __contains__(self, string: str) -> bool:
+        node = self._node(string)
+        return node is not None and self._ends[node] > 0
+
+    def prefix_count(self, prefix: str) -> _Natural:
+        """
+        Number of strings starting with `prefix`.
+        """
+        node = self._node(prefix)
+        return self._counts[node] if node is not None else 0
+
+    def _node(self, prefix: str) -> _Optional[int]:
+        chars, child_starts = self._chars, self._child_starts
+        node = 0
+        for char in prefix:
+            code = ord(char)
+            start, stop = child_starts[node], child_starts[node + 1]
+            node = _bisect_left(chars, code, start, stop)
+            if node == stop or chars[node] != code:
+                return None
+        return node
+
+    def getPrefixesByOccurences(
+        self, min_len: _Natural, ascending_order: bool = False
+    ) -> list[tuple[str, _Natural]]:
+        """
+        Same as `Trie.getPrefixesByOccurences`.
+        """
+        chars, counts, child_starts = self._chars, self._counts, self._child_starts
+        prefixes = []
+        stack = [(0, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if len(prefix) >= min_len and counts[node]:
+                prefixes.append((counts[node], prefix))
+            stack.extend(
+                (child, prefix + chr(chars[child]))
+                for child in range(child_starts[node], child_starts[node + 1])
+            )
+
+        prefixes.sort(reverse=not ascending_order)
+        return [(prefix, count) for count, prefix in prefixes]
@@ -0,0 +1,311 @@
+from array import array as _array
+from typing import (
+    Annotated as _Annotated,
+    Optional as _Optional,
+    Sequence as _Sequence,
+    Union as _Union,
+)
+import zlib as _zlib
+
+from ._affixes import common_prefix_length as _common_prefix_length
+from ._binary import (
+    MappedFile as _MappedFile,
+    Path as _Path,
+    SerializedFormatError,
+    map_arrays as _map_arrays,
+    unmap_arrays as _unmap_arrays,
+    write_arrays as _write_arrays,
+)
+from ._utils import (
+    suffix_array as _suffix_array,
+    SuffixArrayEngine as _SuffixArrayEngine,
+    _index_typecode,
+    _zeros,
+)
+
+
+_Natural = _Annotated[int, ">= 0"]
+_Text = _Union[str, bytes]
+
+_MAGIC = b"PYSA"
+_FORMAT_VERSION = 1
+
+
+def _text_crc(text: _Text) -> int:
+    return _zlib.crc32(text.encode() if isinstance(text, str) else text)
+
+
+class SuffixIndex(_MappedFile):
+    """
+    Full-text index over a suffix array. It is built once and then answers many substring
+    queries in O(m log n) time (m - pattern length, n - text length) without rescanning the text.
+
+    Parameters
+    ----------
+    - `text: str | bytes` - indexed text, any `bytes`-like object (e.g. `mmap.mmap`) is accepted,
+    - `engine = "sais"` - suffix array construction algorithm (see `text._utils.suffix_array`),
+    - `use_lcp: bool = False` - if `True`, queries run the Manber-Myers search: the LCP of every
+        binary search midpoint with both of its boundaries is precomputed (two more arrays of n
+        integers, built on the first such query), so a search compares O(m + log n) characters
+        instead of O(m log n). Plain searches compare whole slices at C speed though, so this only
+        pays off for long patterns over repetitive texts.
+
+    Examples
+    --------
+    >>> index = SuffixIndex("abracadabra")
+    >>> index.find("abra")
+    [0, 7]
+    >>> index.count("a")
+    5
+    >>> "cad" in index
+    True
+
+    An empty pattern is a prefix of every suffix, so it matches at every position of the text.
+
+    Persistence
+    -----------
+    `save` writes the suffix and LCP arrays (not the text) to a versioned, checksummed binary
+    file. `load` memory-maps it read-only, so many processes share one copy of the index through
+    the page cache and opening it does not depend on the text size (unless the opt-in checksum
+    verification is requested). The text itself may be a memory-mapped file as well:
+
+    >>> with open("corpus.bin", "rb") as f:  # doctest: +SKIP
+    ...     corpus = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    >>> SuffixIndex(corpus).save("corpus.sa")  # doctest: +SKIP
+    >>> with SuffixIndex.load("corpus.sa", corpus) as index:  # doctest: +SKIP
+    ...     index.count(b"ERROR")
+    """
+
+    def __init__(
+        self, text: _Text, *, engine: _SuffixArrayEngine = "sais", use_lcp: bool = False
+    ) -> None:
+        sa, _, lcp = _suffix_array(text, engine=engine)
+        self._text = text
+        self._sa: _Sequence[int] = sa
+        self._lcp: _Sequence[int] = lcp
+        self.use_lcp = use_lcp
+        self._mid_lcps: _Optional[tuple[_Sequence[int], _Sequence[int]]] = None
+
+    def save(self, path: _Path) -> None:
+        """
+        Writes the suffix and LCP arrays to `path`, see `SuffixIndex.load`.
+        """
+        typecode = _index_typecode(len(self._sa))
+        meta = _array("q", [len(self._text), isinstance(self._text, str), _text_crc(self._text)])
+        arrays = [
+            seq if isinstance(seq, (_array, memoryview)) else _array(typecode, seq)
+            for seq in (self._sa, self._lcp)
+        ]
+        _write_arrays(path, _MAGIC, _FORMAT_VERSION, [meta, *arrays])
+
+    @classmethod
+    def load(
+        cls, path: _Path, text: _Text, *, use_lcp: bool = False, verify: bool = False
+    ) -> "SuffixIndex":
+        """
+        Opens an index written by `SuffixIndex.save` for `text` without copying it into memory.
+
+        By default only the header, the array layout and the length and type of `text` are
+        checked, so opening takes the same time for any index size - that is what the worker
+        processes sharing an index should use. With `verify=True` the checksums of both the
+        index file and `text` are checked as well, which reads them once; do that once after
+        copying or downloading the index, not in every worker. The returned index keeps the file
+        mapped until `close` is called (or the `with` block it is used in exits).
+
+        Raises
+        ------
+        `SerializedFormatError`(`ValueError`) if the file is not a valid index, or it was built
+        for a different text (a different text of the same length is detected by `verify=True`
+        only).
+        """
+        mapped, arrays = _map_arrays(path, _MAGIC, _FORMAT_VERSION, verify=verify)
+        try:
+            if len(arrays) != 3:
+                raise SerializedFormatError(f"expected 3 arrays, got {len(arrays)}")
+
+            meta, sa, lcp = arrays
+            text_len, is_str, text_crc = meta
+            if text_len != len(text) or bool(is_str) != isinstance(text, str):
+                raise SerializedFormatError("index was built for a different text")
+            if verify and text_crc != _text_crc(text):
+                raise SerializedFormatError("text checksum mismatch")
+
+        except BaseException:
+            _unmap_arrays(mapped, arrays)
+            raise
+
+        meta.release()
+        index = cls.__new__(cls)
+        index._text = text
+        index._sa = sa
+        index._lcp = lcp
+        index.use_lcp = use_lcp
+        index._mid_lcps = None
+        index._attach(mapped, arrays)
+        return index
+
+    @property
+    def text(self) -> _Text:
+        return self._text
+
+    @property
+    def suffix_array(self) -> _Sequence[int]:
+        return self._sa
+
+    @property
+    def lcp(self) -> _Sequence[int]:
+        return self._lcp
+
+    def __len__(self) -> _Natural:
+        return len(self._sa)
+
+    def __contains__(self, pattern: _Text) -> bool:
+        return self.contains(pattern)
+
+    def find(self, pattern: _Text) -> list[int]:
+        """
+        Returns sorted positions of all occurences of `pattern`.
+        """
+        start, stop = self._range(pattern)
+        return sorted(self._sa[start:stop])
+
+    def count(self, pattern: _Text) -> _Natural:
+        """
+        Returns the number of (possibly overlapping) occurences of `pattern`.
+        """
+        if self.use_lcp:
+            return self._upper_bound_lcp(pattern) - self._lower_bound_lcp(pattern)
+
+        return self._upper_bound(pattern) - self._lower_bound(pattern)
+
+    def contains(self, pattern: _Text) -> bool:
+        start = self._lower_bound_lcp(pattern) if self.use_lcp else self._lower_bound(pattern)
+        return self._starts_with(start, pattern)
+
+    def _range(self, pattern: _Text) -> tuple[_Natural, _Natural]:
+        """
+        Range of suffix array ranks of the suffixes starting with `pattern`.
+        """
+        if self.use_lcp:
+            return self._lower_bound_lcp(pattern), self._upper_bound_lcp(pattern)
+
+        return self._lower_bound(pattern), self._upper_bound(pattern)
+
+    def _starts_with(self, rank: _Natural, pattern: _Text) -> bool:
+        sa = self._sa
+        return rank < len(sa) and self._text[sa[rank] : sa[rank] + len(pattern)] == pattern
+
+    def _lower_bound(self, pattern: _Text) -> _Natural:
+        text, sa, m = self._text, self._sa, len(pattern)
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid] : sa[mid] + m] < pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _upper_bound(self, pattern: _Text) -> _Natural:
+        text, sa, m = self._text, self._sa, len(pattern)
+        lo, hi = 0, len(sa)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if text[sa[mid] : sa[mid] + m] <= pattern:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _matched(self, pattern: _Text, suffix: _Natural, skip: _Natural) -> tuple[_Natural, int]:
+        """
+        Compares `pattern` with the suffix starting at `suffix`, assuming the first `skip`
+        characters are equal.
+
+        Returns the length of the common prefix and the comparison result of the first differing
+        characters (`-1` if the suffix is smaller, `1` if greater, `0` if `pattern` is its prefix).
+        """
+        text, m = self._text, len(pattern)
+        # slices of doubling length are compared until one differs, so the characters copied
+        # are proportional to the matched ones rather than to `m`
+        matched, size = skip, 1
+        while matched < m:
+            start, stop = suffix + matched, min(matched + size, m)
+            chunk = text[start : suffix + stop]
+            if chunk != pattern[matched:stop]:
+                matched += _common_prefix_length(chunk, pattern[matched:stop])  # type: ignore
+                break
+            matched, size = stop, size * 2
+        else:
+            return matched, 0
+
+        pos = suffix + matched
+        if pos == len(text) or text[pos] < pattern[matched]:
+            return matched, -1
+        return matched, 1
+
+    def _boundary_lcps(self) -> tuple[_Sequence[int], _Sequence[int]]:
+        """
+        LCPs of every binary search midpoint with the lower and the upper boundary it is
+        reached with (the boundaries of a midpoint are always the same).
+        """
+        if self._mid_lcps is not None:
+            return self._mid_lcps
+
+        lcp, n = self._lcp, len(self._sa)
+        typecode = _index_typecode(n)
+        lower, upper = _zeros(typecode, n), _zeros(typecode, n)
+
+        def interval_lcp(lo: int, hi: int) -> _Natural:
+            if hi - lo == 1:
+                return lcp[hi] if lo >= 0 and hi < n else 0
+            mid = (lo + hi) // 2
+            lower[mid] = left = interval_lcp(lo, mid)
+            upper[mid] = right = interval_lcp(mid, hi)
+            return min(left, right)
+
+        interval_lcp(-1, n)
+        self._mid_lcps = lower, upper
+        return self._mid_lcps
+
+    def _bound_lcp(self, pattern: _Text, upper: bool) -> _Natural:
+        # invariant: suffix(lo) < pattern <= suffix(hi) for the lower bound and
+        # suffix(lo) <= pattern < suffix(hi) for the upper one (comparing only len(pattern)
+        # characters), `lo_matched` / `hi_matched` - their common prefix lengths with `pattern`
+        sa = self._sa
+        lower, upper_lcps = self._boundary_lcps()
+        lo, hi = -1, len(sa)
+        lo_matched = hi_matched = 0
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            # the midpoint shares more with the boundary that matches more of `pattern` than
+            # `pattern` does - it is on the same side, less - it is on the other side
+            if lo_matched >= hi_matched:
+                known = lower[mid]
+                if known > lo_matched:
+                    lo = mid
+                    continue
+                if known < lo_matched:
+                    hi, hi_matched = mid, known
+                    continue
+            else:
+                known = upper_lcps[mid]
+                if known > hi_matched:
+                    hi = mid
+                    continue
+                if known < hi_matched:
+                    lo, lo_matched = mid, known
+                    continue
+
+            matched, order = self._matched(pattern, sa[mid], known)
+            if order > 0 or order == 0 and not upper:
+                hi, hi_matched = mid, matched
+            else:
+                lo, lo_matched = mid, matched
+        return hi
+
+    def _lower_bound_lcp(self, pattern: _Text) -> _Natural:
+        return self._bound_lcp(pattern, upper=False)
+
+    def _upper_bound_lcp(self, pattern: _Text) -> _Natural:
+        return self._bound_lcp(pattern, upper=True)
@@ -1,16 +1,31 @@
 from typing import (
     Annotated as _Annotated,
     Callable as _Callable,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    Literal as _Literal,
+    NamedTuple as _NamedTuple,
     Optional as _Optional,
+    Sequence as _Sequence,
     Union as _Union,
 )
-from itertools import groupby
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from threading import Lock
+from bisect import bisect_left, insort
+from heapq import heapify, heappop, heappush, heapreplace, merge
+from itertools import groupby, islice
 from operator import itemgetter
 
+from ._affixes import common_prefix_length as _common_prefix_length
+
 
 _Char = _Annotated[str, "length == 1"]
 _Natural = _Annotated[int, ">= 0"]
 
+SuffixArrayEngine = _Literal["doubling", "sais"]
+
 
 class Trie:
     """
@@ -27,87 +42,810 @@ class Trie:
     >>> print(prefixes)
     [('not_a_file_', 2), ('not_a_file', 2), ('not_a_fil', 2), ('not_a_fi', 2), ('not_a_f', 2), ('not_a_', 2), ('not_a_file_2', 1), ('not_a_file_1', 1), ('file_3', 1), ('file_2', 1), ('file_1', 1)]
 
+    Nodes are not separate objects - node `i` is described by the i-th items of flat parallel
+    arrays (edge character, prefix and string counts, parent, first child and next sibling
+    links), which takes 32 bytes per node. Inserting and traversing are iterative, so the length
+    of the inserted strings is not limited by the recursion limit. The root (node 0) stands for
+    the empty prefix and counts all inserted strings.
+
+    Prefix counts are kept up to date by `insert` and `remove`, and the sorted prefix view is
+    cached: after the first `getPrefixesByOccurences` call, the next ones only re-sort the
+    prefixes of the strings inserted or removed in the meantime (unless there were so many
+    of them that rebuilding the view is cheaper).
 
     author: Anonta (https://stackoverflow.com/users/5798361/anonta)
     source: https://stackoverflow.com/questions/51456472/python-fastest-algorithm-to-get-the-most-common-prefix-out-of-a-list-of-strings/51457611
     """
 
-    class _TrieNode:
+    _ROOT = 0
+    _NO_NODE = -1
+
+    def __init__(self) -> None:
+        # code point of the character on the edge leading to the node
+        self._chars = array("I")
+        # number of inserted strings starting with the node's prefix
+        self._counts = array("q")
+        # number of inserted strings equal to the node's prefix
+        self._ends = array("q")
+        self._parents = array("i")
+        self._first_child = array("i")
+        self._next_sibling = array("i")
+        # nodes of removed subtrees, reused by `_new_node`
+        self._free: list[int] = []
+        self._new_node(0, Trie._NO_NODE)
+
+        # cached prefix view: {prefix: count} and sorted (count, prefix) pairs of the prefixes
+        # at least `_prefixes_min_len` long
+        self._prefixes: _Optional[dict[str, int]] = None
+        self._sorted_prefixes: list[tuple[int, str]] = []
+        self._prefixes_min_len = 0
+        # strings inserted or removed since the view was cached
+        self._pending: list[str] = []
+        self._pending_chars = 0
+
+        # cached `complete` results: node -> up to `_completions_k` best (-count, string) pairs
+        # of its subtree, dropped along the path of every inserted or removed string
+        self._completions: dict[int, list[tuple[int, str]]] = {}
+        self._completions_k = 10
+
+    def __len__(self) -> _Natural:
+        """
+        Number of nodes, including the root.
         """
-        Helper class for string suffixes trie.
+        return len(self._chars) - len(self._free)
 
-        author: Anonta (https://stackoverflow.com/users/5798361/anonta)
-        source: https://stackoverflow.com/questions/51456472/python-fastest-algorithm-to-get-the-most-common-prefix-out-of-a-list-of-strings/51457611
+    def __contains__(self, string: str) -> bool:
+        node = self._node(string)
+        return node != Trie._NO_NODE and self._ends[node] > 0
+
+    def prefix_count(self, prefix: str) -> _Natural:
+        """
+        Number of inserted strings starting with `prefix`.
         """
+        node = self._node(prefix)
+        return self._counts[node] if node != Trie._NO_NODE else 0
 
-        def __init__(self, character: _Char) -> None:
-            self.count = 1
-            self.character = character
-            self.children: dict[_Char, Trie._TrieNode] = {}
+    def _new_node(self, code: int, parent: int) -> int:
+        if self._free:
+            node = self._free.pop()
+            self._chars[node] = code
+            self._counts[node] = self._ends[node] = 0
+            self._parents[node] = parent
+            self._first_child[node] = Trie._NO_NODE
+        else:
+            node = len(self._chars)
+            self._chars.append(code)
+            self._counts.append(0)
+            self._ends.append(0)
+            self._parents.append(parent)
+            self._first_child.append(Trie._NO_NODE)
+            self._next_sibling.append(Trie._NO_NODE)
 
-        def insert(self, string: str, idx: _Natural) -> None:
-            if idx >= len(string):
-                return
+        if parent != Trie._NO_NODE:
+            self._next_sibling[node] = self._first_child[parent]
+            self._first_child[parent] = node
+        return node
 
-            child = string[idx]
-            if child in self.children:
-                self.children[child].count += 1
-            else:
-                self.children[child] = Trie._TrieNode(string[idx])
+    def _unlink(self, node: int) -> None:
+        """
+        Detaches `node` from its parent and frees its whole subtree.
+        """
+        parent = self._parents[node]
+        next_sibling = self._next_sibling
+        if self._first_child[parent] == node:
+            self._first_child[parent] = next_sibling[node]
+        else:
+            sibling = self._first_child[parent]
+            while next_sibling[sibling] != node:
+                sibling = next_sibling[sibling]
+            next_sibling[sibling] = next_sibling[node]
 
-            self.children[child].insert(string, idx + 1)
+        stack = [node]
+        while stack:
+            freed = stack.pop()
+            stack.extend(self._children(freed))
+            self._free.append(freed)
+            if self._completions:
+                self._completions.pop(freed, None)
 
-    def __init__(self) -> None:
-        self.__root = Trie._TrieNode("")
-        self._prefixes: _Optional[dict[str, int]] = None
+    def _child(self, node: int, code: int) -> int:
+        chars, next_sibling = self._chars, self._next_sibling
+        child = self._first_child[node]
+        while child != Trie._NO_NODE and chars[child] != code:
+            child = next_sibling[child]
+        return child
+
+    def _children(self, node: int) -> _Iterator[int]:
+        next_sibling = self._next_sibling
+        child = self._first_child[node]
+        while child != Trie._NO_NODE:
+            yield child
+            child = next_sibling[child]
+
+    def _node(self, prefix: str) -> int:
+        node = Trie._ROOT
+        for char in prefix:
+            node = self._child(node, ord(char))
+            if node == Trie._NO_NODE:
+                break
+        return node
 
     def insert(self, /, *strings: str) -> None:
+        counts, child_of, new_node = self._counts, self._child, self._new_node
+        for string in strings:
+            if self._completions:
+                self._forget_completions(string)
+            node = Trie._ROOT
+            counts[node] += 1
+            for char in string:
+                code = ord(char)
+                child = child_of(node, code)
+                if child == Trie._NO_NODE:
+                    child = new_node(code, node)
+                counts[child] += 1
+                node = child
+            self._ends[node] += 1
+            self._changed(string)
+
+    def merge(self, other: "Trie", /) -> None:
+        """
+        Adds all strings of `other` to this trie in O(nodes of `other`) time.
+
+        Subtrees missing in this trie are grafted without looking their children up.
+        """
+        other_chars, other_counts, other_ends = other._chars, other._counts, other._ends
+        counts, ends, child_of, new_node = self._counts, self._ends, self._child, self._new_node
+        # (node of `other`, node of this trie, whether the latter was created by this merge)
+        stack = [(Trie._ROOT, Trie._ROOT, False)]
+        while stack:
+            theirs, ours, grafted = stack.pop()
+            counts[ours] += other_counts[theirs]
+            ends[ours] += other_ends[theirs]
+            for their_child in other._children(theirs):
+                code = other_chars[their_child]
+                our_child = Trie._NO_NODE if grafted else child_of(ours, code)
+                if our_child == Trie._NO_NODE:
+                    stack.append((their_child, new_node(code, ours), True))
+                else:
+                    stack.append((their_child, our_child, False))
+
+        self._prefixes = None
+        self._pending.clear()
+        self._completions.clear()
+
+    @classmethod
+    def from_strings(cls, strings: _Iterable[str], *, workers: _Optional[int] = None) -> "Trie":
+        """
+        Builds a trie of `strings` in `workers` processes (`os.cpu_count()` by default).
+
+        The sorted strings are cut into `workers` ranges of equal size (see `_shards`), so the
+        sub-tries built in the process pool share only the prefixes common to neighbouring
+        ranges. Each of them is appended to the result as a block of nodes and only those
+        shared nodes are merged (see `_graft`).
+        """
+        workers = workers or cpu_count() or 1
+        if workers == 1:
+            trie = cls()
+            trie.insert(*strings)
+            return trie
+
+        with ProcessPoolExecutor(workers) as executor:
+            tries = list(executor.map(_built_trie, _shards(strings, workers)))
+
+        trie = cls()
+        for sub_trie in tries:
+            trie._graft(sub_trie)
+        return trie
+
+    def _graft(self, other: "Trie") -> None:
+        """
+        Adds all strings of `other` (which must not have free nodes) by appending its nodes to
+        the node arrays in bulk. Nodes of prefixes present in both tries are then merged into
+        the existing ones and freed, which is cheap when the tries share few prefixes.
+        """
+        # node i > 0 of `other` becomes node i + shift, the root of `other` is the root
+        shift = len(self._chars) - 1
+        moved = lambda links: [link + shift if link >= 0 else link for link in links]
+        their_children = [child + shift for child in other._children(Trie._ROOT)]
+
+        self._chars.extend(other._chars[1:])
+        self._counts.extend(other._counts[1:])
+        self._ends.extend(other._ends[1:])
+        self._parents.fromlist([parent + shift if parent else 0 for parent in other._parents[1:]])
+        self._first_child.fromlist(moved(other._first_child[1:]))
+        self._next_sibling.fromlist(moved(other._next_sibling[1:]))
+        self._counts[Trie._ROOT] += other._counts[Trie._ROOT]
+        self._ends[Trie._ROOT] += other._ends[Trie._ROOT]
+
+        chars, counts, ends = self._chars, self._counts, self._ends
+        parents, first_child, next_sibling = self._parents, self._first_child, self._next_sibling
+        # (node, children of the appended node merged into it)
+        stack = [(Trie._ROOT, their_children)]
+        while stack:
+            ours, children = stack.pop()
+            our_children = {chars[child]: child for child in self._children(ours)}
+            for child in children:
+                our_child = our_children.get(chars[child], Trie._NO_NODE)
+                if our_child == Trie._NO_NODE:
+                    parents[child] = ours
+                    next_sibling[child] = first_child[ours]
+                    first_child[ours] = child
+                    continue
+
+                counts[our_child] += counts[child]
+                ends[our_child] += ends[child]
+                stack.append((our_child, list(self._children(child))))
+                self._free.append(child)
+
+        self._prefixes = None
+        self._pending.clear()
+        self._completions.clear()
+
+    def remove(self, /, *strings: str) -> None:
+        """
+        Removes one occurence of each of `strings`.
+
+        Raises
+        ------
+        `KeyError` if a string has not been inserted (the strings before it are removed)
+        """
+        counts = self._counts
         for string in strings:
-            self.__root.insert(string, 0)
+            node = self._node(string)
+            if node == Trie._NO_NODE or self._ends[node] == 0:
+                raise KeyError(string)
+
+            if self._completions:
+                self._forget_completions(string)
+            self._ends[node] -= 1
+            # the topmost node left without strings is detached with its subtree
+            unused = Trie._NO_NODE
+            while node != Trie._NO_NODE:
+                counts[node] -= 1
+                if counts[node] == 0 and node != Trie._ROOT:
+                    unused = node
+                node = self._parents[node]
+
+            if unused != Trie._NO_NODE:
+                self._unlink(unused)
+            self._changed(string)
+
+    def complete(self, prefix: str, k: _Natural = 10) -> list[tuple[str, _Natural]]:
+        """
+        The `k` most frequently inserted strings starting with `prefix`, with their counts,
+        sorted by count (descending) and then alphabetically.
+
+        Every node visited by a query caches the best completions of its subtree, computed from
+        the cached lists of its children, so repeated queries take O(len(prefix) + k). Inserting
+        or removing a string only drops the lists cached along its path.
+
+        Examples
+        --------
+        >>> trie = Trie()
+        >>> trie.insert("auth", "auth", "audit", "billing")
+        >>> trie.complete("au", 2)
+        [('auth', 2), ('audit', 1)]
+        """
+        if k <= 0:
+            return []
+
+        if k > self._completions_k:
+            self._completions.clear()
+            self._completions_k = k
+
+        node = self._node(prefix)
+        if node == Trie._NO_NODE:
+            return []
+        return [(string, -count) for count, string in self._completions_of(node, prefix)[:k]]
+
+    def _completions_of(self, node: int, prefix: str) -> list[tuple[int, str]]:
+        cache, k, ends, chars = self._completions, self._completions_k, self._ends, self._chars
+        # post-order over the subtree, without descending into the already cached nodes
+        stack = [(node, prefix, False)]
+        while stack:
+            node, prefix, expanded = stack.pop()
+            if node in cache:
+                continue
+            if not expanded:
+                stack.append((node, prefix, True))
+                stack.extend(
+                    (child, prefix + chr(chars[child]), False) for child in self._children(node)
+                )
+                continue
+
+            candidates = [cache[child] for child in self._children(node)]
+            if ends[node]:
+                candidates.append([(-ends[node], prefix)])
+            cache[node] = list(islice(merge(*candidates), k))
+        return cache[node]
+
+    def _forget_completions(self, string: str) -> None:
+        node = Trie._ROOT
+        self._completions.pop(node, None)
+        for char in string:
+            node = self._child(node, ord(char))
+            if node == Trie._NO_NODE:
+                break
+            self._completions.pop(node, None)
+
+    def _changed(self, string: str) -> None:
+        if self._prefixes is None:
+            return
+
+        self._pending.append(string)
+        self._pending_chars += len(string) + 1
+        if self._pending_chars > len(self._sorted_prefixes):
+            # patching would cost more than rebuilding
+            self._prefixes = None
+            self._pending.clear()
+
+    def _refreshed_prefixes(self, min_len: _Natural) -> list[tuple[int, str]]:
+        if self._prefixes is None or min_len < self._prefixes_min_len:
+            self._prefixes = {
+                prefix: count for prefix, count in self._discoverPrefixes(min_len) if count
+            }
+            self._prefixes_min_len = min_len
+            self._sorted_prefixes = sorted(
+                (count, prefix) for prefix, count in self._prefixes.items()
+            )
+            self._pending.clear()
+            self._pending_chars = 0
+            return self._sorted_prefixes
+
+        prefixes, sorted_prefixes, counts = self._prefixes, self._sorted_prefixes, self._counts
+        for string in dict.fromkeys(self._pending):
+            node = Trie._ROOT
+            for depth in range(len(string) + 1):
+                if depth and node != Trie._NO_NODE:
+                    node = self._child(node, ord(string[depth - 1]))
+                if depth < self._prefixes_min_len:
+                    continue
+                count = counts[node] if node != Trie._NO_NODE else 0
+
+                prefix = string[:depth]
+                cached_count = prefixes.get(prefix, 0)
+                if cached_count == count:
+                    continue
+
+                if cached_count:
+                    del sorted_prefixes[bisect_left(sorted_prefixes, (cached_count, prefix))]
+                if count:
+                    insort(sorted_prefixes, (count, prefix))
+                    prefixes[prefix] = count
+                else:
+                    del prefixes[prefix]
+
+        self._pending.clear()
+        self._pending_chars = 0
+        return sorted_prefixes
 
-    # just a wrapper function
     def getPrefixesByOccurences(
         self, min_len: _Natural, ascending_order=False
     ) -> list[tuple[str, _Natural]]:
         # pair of prefix, and frequency
-        # prefixes shorter than min_length are not stored
-        self._prefixes_with_occurences = {}
-
-        self.__discoverPrefixes(self.__root, [], min_len, 0)
+        # prefixes shorter than min_length are not returned
+        sorted_prefixes = self._refreshed_prefixes(min_len)
 
         # return the prefixes in sorted order
-        reversed_items: _Callable[[tuple[str, _Natural]], tuple[_Natural, str]] = lambda x: (
-            x[1],
-            x[0],
+        return [
+            (prefix, count)
+            for count, prefix in (
+                sorted_prefixes if ascending_order else reversed(sorted_prefixes)
+            )
+            if len(prefix) >= min_len
+        ]
+
+    def top_k_prefixes(
+        self, k: _Natural, min_len: _Natural = 1, ascending_order: bool = False
+    ) -> list[tuple[str, _Natural]]:
+        """
+        The first `k` items of `getPrefixesByOccurences(min_len, ascending_order)`.
+
+        The trie is walked once with children in character order, so the preorder rank of
+        a node is the lexicographic rank of its prefix. The best `k` (count, rank) pairs are
+        kept in a bounded heap, and prefix strings are built only for them. In descending
+        order, subtrees whose count is already below the `k`-th best are skipped, because
+        a node never counts more strings than its parent.
+        """
+        if k <= 0:
+            return []
+
+        chars, counts = self._chars, self._counts
+        sign = -1 if ascending_order else 1
+        # min-heap of (sign * count, sign * rank, node) of the best `k` nodes so far
+        heap: list[tuple[int, int, int]] = []
+        stack = [(Trie._ROOT, 0)]
+        rank = 0
+        while stack:
+            node, depth = stack.pop()
+            count = counts[node]
+            if not ascending_order and len(heap) == k and count < heap[0][0]:
+                continue
+
+            if depth >= min_len and count:
+                item = (sign * count, sign * rank, node)
+                if len(heap) < k:
+                    heappush(heap, item)
+                elif item > heap[0]:
+                    heapreplace(heap, item)
+            rank += 1
+
+            children = sorted(self._children(node), key=chars.__getitem__, reverse=True)
+            stack.extend((child, depth + 1) for child in children)
+
+        return [(self._prefix(node), counts[node]) for *_, node in sorted(heap, reverse=True)]
+
+    def _prefix(self, node: int) -> str:
+        chars, parents = self._chars, self._parents
+        prefix_characters = []
+        while node != Trie._ROOT:
+            prefix_characters.append(chr(chars[node]))
+            node = parents[node]
+        return "".join(reversed(prefix_characters))
+
+    # do a dfs on the trie
+    # discovers the prefixes in the trie not shorter than `min_length` with their counts
+    def _discoverPrefixes(self, min_length: _Natural) -> _Iterator[tuple[str, _Natural]]:
+        counts = self._counts
+        return ((prefix, counts[node]) for prefix, node in self._discoverNodes(min_length))
+
+    def _discoverNodes(self, min_length: _Natural) -> _Iterator[tuple[str, int]]:
+        chars, children = self._chars, self._children
+        prefix_characters: list[str] = []
+        stack = [(Trie._ROOT, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if depth:
+                del prefix_characters[depth - 1 :]
+                prefix_characters.append(chr(chars[node]))
+
+            if depth >= min_length:
+                yield "".join(prefix_characters), node
+
+            stack.extend((child, depth + 1) for child in children(node))
+
+
+def _shards(strings: _Iterable[str], count: int) -> list[list[str]]:
+    """
+    `strings` sorted and cut into at most `count` non-empty ranges of equal size.
+
+    Unlike grouping by a leading character, this balances strings sharing a long prefix
+    (paths, URLs) as well. Only the prefixes common to the last string of a range and the
+    first one of the next range occur in more than one range.
+    """
+    strings = sorted(strings)
+    size = -(-len(strings) // count)
+    return [strings[start : start + size] for start in range(0, len(strings), size or 1)]
+
+
+def _built_trie(strings: list[str]) -> Trie:
+    trie = Trie()
+    trie.insert(*strings)
+    return trie
+
+
+def _shard_prefixes(
+    strings: list[str], min_len: _Natural, ascending_order: bool, shared: tuple[int, int]
+) -> tuple[list[tuple[str, _Natural]], dict[str, _Natural]]:
+    """
+    Prefixes of a shard by occurences, without the ones the shard shares with its neighbours
+    (the first `shared[0]` characters of its first string and the first `shared[1]` ones of
+    its last string, `-1` if there is no neighbour), which are counted separately.
+    """
+    first, last = strings[0], strings[-1]
+    first_shared, last_shared = shared
+    longest_shared = max(shared)
+
+    prefixes, shared_counts = [], {}
+    for prefix, count in _built_trie(strings).getPrefixesByOccurences(min_len, ascending_order):
+        if len(prefix) <= longest_shared and (
+            (len(prefix) <= first_shared and first.startswith(prefix))
+            or (len(prefix) <= last_shared and last.startswith(prefix))
+        ):
+            shared_counts[prefix] = count
+        else:
+            prefixes.append((prefix, count))
+    return prefixes, shared_counts
+
+
+def sharded_prefixes_by_occurences(
+    strings: _Iterable[str],
+    *,
+    min_len: _Natural,
+    ascending_order: bool = False,
+    workers: _Optional[int] = None,
+) -> list[tuple[str, _Natural]]:
+    """
+    `Trie.getPrefixesByOccurences` of `strings` computed in `workers` processes
+    (`os.cpu_count()` by default).
+
+    Strings are sharded into sorted ranges (see `_shards`). Every worker builds the trie of its
+    shard and sorts its prefixes, and the sorted views are merged, like in
+    `ConcurrentTrie.getPrefixesByOccurences` - no trie is built in this process. Only the few
+    prefixes shared by neighbouring shards have their counts summed here.
+    """
+    workers = workers or cpu_count() or 1
+    shards = _shards(strings, workers)
+    common = [
+        _common_prefix_length(shard[-1], next_shard[0])
+        for shard, next_shard in zip(shards, shards[1:])
+    ]
+    shared = list(zip([-1, *common], [*common, -1]))
+    with ProcessPoolExecutor(len(shards) or 1) as executor:
+        results = list(
+            executor.map(
+                _shard_prefixes,
+                shards,
+                [min_len] * len(shards),
+                [ascending_order] * len(shards),
+                shared,
+            )
         )
 
+    shared_counts: dict[str, int] = {}
+    for _, counts in results:
+        for prefix, count in counts.items():
+            shared_counts[prefix] = shared_counts.get(prefix, 0) + count
+
+    key = lambda item: (item[1], item[0])
+    views = [prefixes for prefixes, _ in results]
+    views.append(sorted(shared_counts.items(), key=key, reverse=not ascending_order))
+    return list(merge(*views, key=key, reverse=not ascending_order))
+
+
+class ConcurrentTrie:
+    """
+    `Trie` safe to share between threads, with lock striping.
+
+    Strings are distributed by their first `key_len` characters among `stripes` independent
+    tries, each guarded by its own lock, so threads inserting strings with different leading
+    characters rarely wait for each other (and run in parallel on free-threaded CPython
+    builds). `key_len` should be longer than the prefix most strings share (e.g. the
+    `https://host/` of URLs), otherwise they all fall into one stripe. `insert` and `remove` take
+    a batch of strings, group it by stripe and acquire every lock once per batch instead of
+    once per string.
+
+    A prefix at least `key_len` long is found in one stripe only. Shorter prefixes may occur in
+    several stripes, so queries about them visit all the stripes and sum their counts. Queries
+    lock the stripes one at a time, so while other threads are writing they see each stripe
+    in a consistent state, but not necessarily the whole trie at a single moment.
+
+    Examples
+    --------
+    >>> trie = ConcurrentTrie()
+    >>> with ThreadPoolExecutor() as executor:  # doctest: +SKIP
+    ...     executor.map(lambda batch: trie.insert(*batch), batches)
+    >>> trie.getPrefixesByOccurences(6)  # doctest: +SKIP
+    """
+
+    def __init__(self, stripes: int = 16, *, key_len: int = 16) -> None:
+        if stripes < 1:
+            raise ValueError(f"expected `stripes` >= 1, got {stripes}")
+        if key_len < 1:
+            raise ValueError(f"expected `key_len` >= 1, got {key_len}")
+
+        self._tries = [Trie() for _ in range(stripes)]
+        self._locks = [Lock() for _ in range(stripes)]
+        self._key_len = key_len
+
+    def _stripe(self, string: str) -> int:
+        return hash(string[: self._key_len]) % len(self._tries)
+
+    def _batches(self, strings: _Iterable[str]) -> dict[int, list[str]]:
+        batches: dict[int, list[str]] = {}
+        for string in strings:
+            batches.setdefault(self._stripe(string), []).append(string)
+        return batches
+
+    def __len__(self) -> _Natural:
+        """
+        Number of nodes, including the root. Nodes of the prefixes occurring in several
+        stripes are counted once.
+        """
+        total = 0
+        shared: set[str] = set()
+        for trie, lock in zip(self._tries, self._locks):
+            with lock:
+                short = self._short_prefixes(trie)
+                total += len(trie) - len(short)
+            shared.update(short)
+        return total + len(shared)
+
+    def _short_prefixes(self, trie: Trie) -> set[str]:
+        """
+        Prefixes of the nodes of `trie` shorter than `key_len`.
+        """
+        chars, key_len = trie._chars, self._key_len
+        prefixes = set()
+        stack = [(Trie._ROOT, "")]
+        while stack:
+            node, prefix = stack.pop()
+            prefixes.add(prefix)
+            if len(prefix) + 1 < key_len:
+                stack.extend((child, prefix + chr(chars[child])) for child in trie._children(node))
+        return prefixes
+
+    def __contains__(self, string: str) -> bool:
+        stripe = self._stripe(string)
+        with self._locks[stripe]:
+            return string in self._tries[stripe]
+
+    def prefix_count(self, prefix: str) -> _Natural:
+        """
+        Number of inserted strings starting with `prefix`.
+        """
+        if len(prefix) >= self._key_len:
+            stripe = self._stripe(prefix)
+            with self._locks[stripe]:
+                return self._tries[stripe].prefix_count(prefix)
+
+        total = 0
+        for trie, lock in zip(self._tries, self._locks):
+            with lock:
+                total += trie.prefix_count(prefix)
+        return total
+
+    def insert(self, /, *strings: str) -> None:
+        for stripe, batch in self._batches(strings).items():
+            with self._locks[stripe]:
+                self._tries[stripe].insert(*batch)
+
+    def remove(self, /, *strings: str) -> None:
+        """
+        Removes one occurence of each of `strings`.
+
+        Raises
+        ------
+        `KeyError` if a string is not in the trie, the strings of its stripe batch preceding it
+        are already removed then.
+        """
+        for stripe, batch in self._batches(strings).items():
+            with self._locks[stripe]:
+                self._tries[stripe].remove(*batch)
+
+    def getPrefixesByOccurences(
+        self, min_len: _Natural, ascending_order=False
+    ) -> list[tuple[str, _Natural]]:
+        """
+        Same as `Trie.getPrefixesByOccurences`. Prefixes at least `key_len` long are found in
+        one stripe only, so the sorted views of the stripes are merged, and only the counts
+        of the shorter prefixes are summed.
+        """
+        key_len = self._key_len
+        views = []
+        shared: dict[str, int] = {}
+        for trie, lock in zip(self._tries, self._locks):
+            with lock:
+                prefixes = trie.getPrefixesByOccurences(min_len, ascending_order)
+            if min_len < key_len:
+                for prefix, count in prefixes:
+                    if len(prefix) < key_len:
+                        shared[prefix] = shared.get(prefix, 0) + count
+                prefixes = [item for item in prefixes if len(item[0]) >= key_len]
+            views.append(prefixes)
+
+        key = lambda item: (item[1], item[0])
+        views.append(sorted(shared.items(), key=key, reverse=not ascending_order))
+        return list(merge(*views, key=key, reverse=not ascending_order))
+
+    def snapshot(self) -> Trie:
+        """
+        Plain `Trie` with the strings of all the stripes.
+        """
+        trie = Trie()
+        for stripe, lock in zip(self._tries, self._locks):
+            with lock:
+                trie.merge(stripe)
+        return trie
+
+
+class StreamingPrefixCounter:
+    """
+    Approximate prefix counts over an unbounded stream of strings in bounded memory.
+
+    Strings are counted in a `Trie` of at most `max_nodes` nodes (exceeded temporarily by at
+    most the length of the string being inserted). When it grows bigger, the leaves with the
+    smallest upper bound of their count are evicted (Space-Saving style) until a quarter of
+    the nodes is free. `error_bound` is the greatest upper bound evicted so far - a prefix
+    seen again after its node was evicted gets a new node whose count may lack at most that
+    many occurences.
+
+    For every reported `(prefix, count, error)`: `count <= true count <= count + error`.
+    Prefixes occuring more than `error_bound` times are never missing from the result.
+
+    Examples
+    --------
+    >>> counter = StreamingPrefixCounter(max_nodes=100_000)
+    >>> with open("access.log") as log:  # doctest: +SKIP
+    ...     counter.update(line.split()[6] for line in log)
+    >>> counter.prefixes_by_occurences(min_len=5)[:10]  # doctest: +SKIP
+    """
+
+    def __init__(self, max_nodes: int) -> None:
+        if max_nodes < 2:
+            raise ValueError(f"expected `max_nodes` >= 2, got {max_nodes}")
+
+        self.max_nodes = max_nodes
+        self._trie = Trie()
+        # upper bound of occurences missed by the node's count
+        self._errors = array("q", [0])
+        self._error_bound = 0
+
+    @property
+    def error_bound(self) -> _Natural:
+        return self._error_bound
+
+    def __len__(self) -> _Natural:
+        """
+        Number of trie nodes, including the root.
+        """
+        return len(self._trie)
+
+    def update(self, strings: _Iterable[str]) -> None:
+        trie, errors = self._trie, self._errors
+        counts, child_of, new_node = trie._counts, trie._child, trie._new_node
+        for string in strings:
+            node = Trie._ROOT
+            counts[node] += 1
+            for char in string:
+                code = ord(char)
+                child = child_of(node, code)
+                if child == Trie._NO_NODE:
+                    child = new_node(code, node)
+                    if child < len(errors):
+                        errors[child] = self._error_bound
+                    else:
+                        errors.append(self._error_bound)
+                counts[child] += 1
+                node = child
+
+            if len(trie) > self.max_nodes:
+                self._evict(self.max_nodes - self.max_nodes // 4)
+
+    def _evict(self, target_nodes: int) -> None:
+        trie, errors = self._trie, self._errors
+        counts, parents, first_child = trie._counts, trie._parents, trie._first_child
+        leaves = []
+        stack = list(trie._children(Trie._ROOT))
+        while stack:
+            node = stack.pop()
+            if first_child[node] == Trie._NO_NODE:
+                leaves.append((counts[node] + errors[node], node))
+            else:
+                stack.extend(trie._children(node))
+        heapify(leaves)
+        while len(trie) > target_nodes and leaves:
+            upper_bound, node = heappop(leaves)
+            self._error_bound = max(self._error_bound, upper_bound)
+            parent = parents[node]
+            trie._unlink(node)
+            if parent != Trie._ROOT and first_child[parent] == Trie._NO_NODE:
+                heappush(leaves, (counts[parent] + errors[parent], parent))
+
+    def prefixes_by_occurences(
+        self, min_len: _Natural = 1, ascending_order: bool = False
+    ) -> list[tuple[str, _Natural, _Natural]]:
+        """
+        `(prefix, count, error)` triples sorted like `Trie.getPrefixesByOccurences`.
+        """
+        counts, errors = self._trie._counts, self._errors
         return sorted(
-            self._prefixes_with_occurences.items(),
-            key=reversed_items,
+            (
+                (prefix, counts[node], errors[node])
+                for prefix, node in self._trie._discoverNodes(max(min_len, 1))
+            ),
+            key=lambda item: (item[1], item[0]),
             reverse=not ascending_order,
         )
 
-    # do a dfa search on the trie
-    # discovers the prefixes in the trie and stores them in the self.prefixes dictionary
-    def __discoverPrefixes(
-        self,
-        node: _TrieNode,
-        prefix_characters: list[str],
-        min_length: _Natural,
-        actual_len: _Natural,
-    ) -> None:
-        if actual_len >= min_length:
-            self._prefixes_with_occurences[
-                "".join(prefix_characters) + node.character
-            ] = node.count
 
-        for char_node in node.children.values():
-            prefix_characters.append(node.character)
-            self.__discoverPrefixes(char_node, prefix_characters, min_length, actual_len + 1)
-            prefix_characters.pop()
-
-
-def suffix_array(text: str, _step: int = 16):
+def suffix_array(
+    text: _Union[str, bytes],
+    _step: int = 16,
+    *,
+    engine: SuffixArrayEngine = "doubling",
+    max_memory: _Optional[_Natural] = None,
+):
     """
     Find the longest repeated substring.
     "Efficient way to find longest duplicate string for Python (From Programming Pearls)"
@@ -125,8 +863,18 @@ def suffix_array(text: str, _step: int = 16):
         _step: Is only for optimization and testing. It is the optimal length
                of substrings used for initial pre-sorting. The bigger value is
                faster if there is enough memory. Memory requirements are
-               approximately (estimate for 32 bit Python 3.3):
-                   len(text) * (29 + (_size + 20 if _size > 2 else 0)) + 1MB
+               given by `estimate_suffix_array_memory`.
+               Ignored by the "sais" engine.
+        engine: "doubling" (default) - prefix doubling described above,
+                   returns lists,
+                "sais" - linear time SA-IS (induced sorting) construction with
+                   Kasai's LCP, returns compact `array.array`s of typecode "i"
+                   (or "q" for texts longer than 2**31 - 1). Intended for large
+                   texts (10**7+ characters).
+        max_memory: Optional budget [B] for the construction. The "doubling"
+               engine lowers `_step` to fit in it and falls back to "sais"
+               if no step does. `MemoryError` is raised before anything is
+               allocated if the budget cannot be met at all.
     Return value:      (tuple)
       (sa, rsa, lcp)
         sa:  Suffix array                  for i in range(1, size):
@@ -146,6 +894,15 @@ def suffix_array(text: str, _step: int = 16):
     author: https://gist.github.com/hynekcer
     source: https://gist.github.com/hynekcer/fa340f3b63826168ffc0c4b33310ae9c
     """
+    if engine not in ("doubling", "sais"):
+        raise ValueError(f'expected `engine` to be "doubling" or "sais", got "{engine}"')
+
+    if max_memory is not None:
+        engine, _step = _fit_memory(text, _step, engine, max_memory)
+
+    if engine == "sais":
+        return _suffix_array_sais(text)
+
     tx = text
     size = len(tx)
     step = min(max(_step, 1), len(tx))
@@ -203,3 +960,320 @@ def suffix_array(text: str, _step: int = 16):
     if size > 0:
         lcp[0] = 0  # type: ignore
     return sa, rsa, lcp
+
+
+def _index_typecode(size: _Natural) -> str:
+    """
+    Smallest signed `array` typecode able to hold indices of a text of length `size` and `-1`.
+    """
+    return "i" if size < 2**31 - 1 else "q"
+
+
+def _zeros(typecode: str, size: _Natural) -> array:
+    return array(typecode, bytes(size * array(typecode).itemsize))
+
+
+def _text_codes(text: _Union[str, bytes]) -> tuple[_Sequence[int], int]:
+    """
+    Maps `text` onto a sequence of integer codes preserving the order of characters.
+
+    Returns the codes and the maximal code. `bytes`-like texts are used as they are (no copy).
+    """
+    if isinstance(text, str):
+        alphabet = {char: code for code, char in enumerate(sorted(set(text)))}
+        return array(_index_typecode(len(alphabet)), map(alphabet.__getitem__, text)), max(
+            len(alphabet) - 1, 0
+        )
+
+    return text, 255
+
+
+def _sais(s: _Sequence[int], upper: int) -> array:
+    """
+    SA-IS suffix array construction (Nong, Zhang & Chan, 2009) in O(n) time.
+
+    `s` consists of integers from range [0, `upper`]. Recursion depth is O(log n).
+
+    source of the algorithm layout: https://github.com/atcoder/ac-library (string.hpp, `sa_is`)
+    """
+    n = len(s)
+    typecode = _index_typecode(n)
+    if n == 0:
+        return array(typecode)
+    if n == 1:
+        return array(typecode, [0])
+    if n == 2:
+        return array(typecode, [0, 1] if s[0] < s[1] else [1, 0])
+
+    sa = _zeros(typecode, n)
+    # ls[i] - whether the suffix starting at i is of S-type (smaller than the next one)
+    ls = bytearray(n)
+    for i in range(n - 2, -1, -1):
+        ls[i] = ls[i + 1] if s[i] == s[i + 1] else s[i] < s[i + 1]
+
+    # bucket boundaries
+    sum_l = [0] * (upper + 1)
+    sum_s = [0] * (upper + 1)
+    for i in range(n):
+        if ls[i]:
+            sum_l[s[i] + 1] += 1
+        else:
+            sum_s[s[i]] += 1
+    for i in range(upper + 1):
+        sum_s[i] += sum_l[i]
+        if i < upper:
+            sum_l[i + 1] += sum_s[i]
+
+    unset = array(typecode, [-1]) * n
+
+    def induce(lms: _Sequence[int]) -> None:
+        sa[:] = unset
+
+        buf = sum_s[:]
+        for d in lms:
+            if d == n:
+                continue
+            sa[buf[s[d]]] = d
+            buf[s[d]] += 1
+
+        buf = sum_l[:]
+        sa[buf[s[n - 1]]] = n - 1
+        buf[s[n - 1]] += 1
+        for i in range(n):
+            v = sa[i]
+            if v >= 1 and not ls[v - 1]:
+                sa[buf[s[v - 1]]] = v - 1
+                buf[s[v - 1]] += 1
+
+        buf = sum_l[:]
+        for i in range(n - 1, -1, -1):
+            v = sa[i]
+            if v >= 1 and ls[v - 1]:
+                buf[s[v - 1] + 1] -= 1
+                sa[buf[s[v - 1] + 1]] = v - 1
+
+    # leftmost S-type positions
+    lms_map = array(typecode, [-1]) * (n + 1)
+    lms = array(typecode)
+    for i in range(1, n):
+        if not ls[i - 1] and ls[i]:
+            lms_map[i] = len(lms)
+            lms.append(i)
+    m = len(lms)
+
+    induce(lms)
+
+    if m:
+        sorted_lms = array(typecode, (v for v in sa if lms_map[v] != -1))
+        rec_s = _zeros(typecode, m)
+        rec_upper = 0
+        for i in range(1, m):
+            left, right = sorted_lms[i - 1], sorted_lms[i]
+            end_left = lms[lms_map[left] + 1] if lms_map[left] + 1 < m else n
+            end_right = lms[lms_map[right] + 1] if lms_map[right] + 1 < m else n
+            same = True
+            if end_left - left != end_right - right:
+                same = False
+            else:
+                while left < end_left:
+                    if s[left] != s[right]:
+                        break
+                    left += 1
+                    right += 1
+                if left == n or s[left] != s[right]:
+                    same = False
+            if not same:
+                rec_upper += 1
+            rec_s[lms_map[sorted_lms[i]]] = rec_upper
+
+        rec_sa = _sais(rec_s, rec_upper)
+        for i in range(m):
+            sorted_lms[i] = lms[rec_sa[i]]
+        induce(sorted_lms)
+
+    return sa
+
+
+def _kasai(s: _Sequence[int], sa: _Sequence[int]) -> tuple[array, array]:
+    """
+    Kasai's O(n) LCP construction. Returns the reverse suffix array and the LCP array in
+    the `suffix_array` convention (`lcp[i]` is the LCP of `sa[i - 1]` and `sa[i]`, `lcp[0] == 0`).
+    """
+    n = len(s)
+    typecode = _index_typecode(n)
+    rsa = _zeros(typecode, n)
+    for rank, pos in enumerate(sa):
+        rsa[pos] = rank
+
+    lcp = _zeros(typecode, n)
+    h = 0
+    for i in range(n):
+        rank = rsa[i]
+        if rank == 0:
+            h = 0
+            continue
+        j = sa[rank - 1]
+        while i + h < n and j + h < n and s[i + h] == s[j + h]:
+            h += 1
+        lcp[rank] = h
+        if h > 0:
+            h -= 1
+
+    return rsa, lcp
+
+
+def _suffix_array_sais(text: _Union[str, bytes]) -> tuple[array, array, array]:
+    codes, upper = _text_codes(text)
+    sa = _sais(codes, upper)
+    rsa, lcp = _kasai(codes, sa)
+    return sa, rsa, lcp
+
+
+def generalized_suffix_array(
+    texts: _Sequence[_Union[str, bytes]]
+) -> tuple[array, array, array, array]:
+    """
+    Suffix array of all `texts` joined with unique separators, built with SA-IS in one pass.
+
+    Every text is followed by its own separator, smaller than any character, so no common
+    prefix crosses a text boundary and the suffixes starting with separators take the first
+    `len(texts)` ranks.
+
+    Return value:      (tuple)
+      (sa, lcp, docs, starts)
+        sa:     suffix array of the joined texts,
+        lcp:    LCP array in the `suffix_array` convention,
+        docs:   index of the text each position of the joined texts belongs to,
+        starts: offset of each text in the joined texts.
+    """
+    n_texts = len(texts)
+    alphabet = sorted(set().union(*map(set, texts)))
+    codes_of = {char: code for code, char in enumerate(alphabet, n_texts)}
+    size = sum(map(len, texts)) + n_texts
+    typecode = _index_typecode(max(size, len(codes_of) + n_texts))
+
+    codes = array(typecode)
+    docs = array(typecode)
+    starts = array(typecode)
+    for doc, text in enumerate(texts):
+        starts.append(len(codes))
+        codes.extend(map(codes_of.__getitem__, text))
+        codes.append(doc)
+        docs.extend(array(typecode, [doc]) * (len(text) + 1))
+
+    sa = _sais(codes, max(len(codes_of) + n_texts - 1, 0))
+    _, lcp = _kasai(codes, sa)
+    return sa, lcp, docs, starts
+
+
+class LcpInterval(_NamedTuple):
+    """
+    Internal node of the (virtual) suffix tree: suffixes of ranks `start`..`stop - 1` share
+    exactly `lcp` first characters, the longest prefix they share with any other suffix is
+    `parent_lcp` long. `first` and `last` are the smallest and the greatest of their positions.
+    """
+
+    lcp: _Natural
+    start: _Natural
+    stop: _Natural
+    first: _Natural
+    last: _Natural
+    parent_lcp: _Natural
+
+
+def lcp_intervals(sa: _Sequence[int], lcp: _Sequence[int]) -> _Iterator[LcpInterval]:
+    """
+    Bottom-up traversal of the LCP intervals (Abouelhoda, Kurtz & Ohlebusch, 2004) in O(n) time
+    and O(height) memory. The root interval (`lcp == 0`) is not reported.
+    """
+    # [lcp, start, first, last] of the intervals still open
+    stack = [[0, 0, len(sa), -1]]
+    for i in range(1, len(sa) + 1):
+        current = lcp[i] if i < len(sa) else 0
+        start = i - 1
+        first = last = sa[i - 1]
+        while current < stack[-1][0]:
+            top_lcp, start, top_first, top_last = stack.pop()
+            first, last = min(first, top_first), max(last, top_last)
+            yield LcpInterval(top_lcp, start, i, first, last, max(current, stack[-1][0]))
+
+        top = stack[-1]
+        if current > top[0]:
+            stack.append([current, start, first, last])
+        else:
+            top[2], top[3] = min(top[2], first), max(top[3], last)
+
+
+# peak bytes per character measured with `tracemalloc` on 64-bit CPython 3.11
+# (random, periodic and unary texts, the worst case taken)
+_DOUBLING_BYTES_PER_CHAR = 140
+_DOUBLING_BYTES_PER_KEY_CHAR_BASE = 105
+_SAIS_BYTES_PER_INDEX = 11
+_BASE_MEMORY = 1 << 20
+
+
+def estimate_suffix_array_memory(
+    n: _Natural, step: int = 16, *, engine: SuffixArrayEngine = "doubling", char_size: int = 1
+) -> _Natural:
+    """
+    Estimates the peak memory [B] used by `suffix_array` for a text of `n` characters
+    on 64-bit CPython.
+
+    Parameters
+    ----------
+    - `n: int` - text length,
+    - `step: int = 16` - `suffix_array`'s `_step` (ignored by the "sais" engine),
+    - `engine = "doubling"` - construction algorithm,
+    - `char_size: int = 1` - bytes per character of the text: 1 for `bytes` and Latin-1 `str`,
+        2 or 4 for `str` with wider characters (see PEP 393)
+
+    The "doubling" engine needs `n * max(140, 105 + step * char_size)` bytes: lists of boxed
+    integers for the arrays, the pre-sorting keys of `step` characters and the merge buffers.
+    The "sais" engine needs about 11 typed array items of 4 bytes (8 bytes for texts longer
+    than 2**31 - 1 characters) per character.
+    """
+    if engine == "sais":
+        return _BASE_MEMORY + n * _SAIS_BYTES_PER_INDEX * array(_index_typecode(n)).itemsize
+
+    step = min(max(step, 1), max(n, 1))
+    per_char = max(_DOUBLING_BYTES_PER_CHAR, _DOUBLING_BYTES_PER_KEY_CHAR_BASE + step * char_size)
+    return _BASE_MEMORY + n * per_char
+
+
+def _char_size(text: _Union[str, bytes]) -> int:
+    """
+    Bytes per character of `text` in memory - for `str` the width of its widest character
+    (PEP 393).
+    """
+    if not isinstance(text, str) or text.isascii():
+        return 1
+    widest = ord(max(text))
+    return 1 if widest < 0x100 else 2 if widest < 0x10000 else 4
+
+
+def _fit_memory(
+    text: _Union[str, bytes], step: int, engine: SuffixArrayEngine, max_memory: _Natural
+) -> tuple[SuffixArrayEngine, int]:
+    """
+    The most precise `suffix_array` configuration which fits in `max_memory`.
+    """
+    n = len(text)
+    char_size = _char_size(text)
+
+    if engine == "doubling":
+        step = max(step, 1)
+        while True:
+            if estimate_suffix_array_memory(n, step, char_size=char_size) <= max_memory:
+                return engine, step
+            if step == 1:
+                break
+            step //= 2
+
+    required = estimate_suffix_array_memory(n, engine="sais")
+    if required > max_memory:
+        raise MemoryError(
+            f"suffix array of {n} characters needs at least {required} B, "
+            f"`max_memory` is {max_memory} B"
+        )
+
+    return "sais", step
@@ -1,12 +1,334 @@
-from typing import Mapping as _Mapping, Callable as _Callable
+from typing import (
+    Annotated as _Annotated,
+    Any as _Any,
+    AnyStr as _AnyStr,
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    Literal as _Literal,
+    Mapping as _Mapping,
+    NamedTuple as _NamedTuple,
+    Optional as _Optional,
+    Protocol as _Protocol,
+    Union as _Union,
+)
+from collections import OrderedDict as _OrderedDict, deque as _deque
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from itertools import islice as _islice
+from os import cpu_count as _cpu_count
+from threading import Lock as _Lock
 import re as _re
 
+from ._aho_corasick import AhoCorasick as _AhoCorasick
+
+
+_Natural = _Annotated[int, ">= 0"]
+
+ReplaceEngine = _Literal["regex", "aho-corasick"]
+
+
+class _Readable(_Protocol):
+    def read(self, size: int, /) -> _Any:
+        ...
+
+
+class _Writable(_Protocol):
+    def write(self, data: _Any, /) -> _Any:
+        ...
+
+
+_Source = _Union[_Readable, _Iterable[_Union[str, bytes, bytearray, memoryview]]]
+
 
 def capitalized_first_letter_str(s: str, /) -> str:
     return s[0].upper() + s[1:] if s else ""
 
 
-def replace_many(text: str, /, mapping: _Mapping[str, str], *, ignore_case: bool = False) -> str:
+def _folded_char(char: str) -> str:
+    # characters lowercased to more than one (e.g. "İ") are kept, match offsets must not move
+    lower = char.lower()
+    return lower if len(lower) == 1 else char
+
+
+def _folded_byte(byte: int) -> int:
+    return byte + 32 if 65 <= byte <= 90 else byte
+
+
+def _chunks(source: _Source, chunk_size: int) -> _Iterator[_Union[str, bytes]]:
+    if isinstance(source, (str, bytes, bytearray, memoryview)):
+        source = [source]
+
+    if hasattr(source, "read"):
+        while chunk := source.read(chunk_size):  # type: ignore
+            yield chunk
+        return
+
+    for chunk in source:  # type: ignore
+        yield bytes(chunk) if isinstance(chunk, (bytearray, memoryview)) else chunk
+
+
+class Replacer:
+    """
+    `replace_many` with the mapping compiled once, for replacing in many texts.
+
+    Examples
+    --------
+    >>> redact = Replacer({"password": "***", "token": "***"}, ignore_case=True)
+    >>> redact("Password: x, TOKEN: y")
+    '***: x, ***: y'
+    >>> redact.count("password, passwords")
+    2
+    >>> list(redact.sub_many(["token", "none"]))
+    ['***', 'none']
+
+    The mapping may be of `bytes` as well, then texts have to be `bytes` (and `ignore_case`
+    applies to ASCII letters only).
+    """
+
+    def __init__(
+        self,
+        mapping: _Mapping[_AnyStr, _AnyStr],
+        *,
+        ignore_case: bool = False,
+        engine: ReplaceEngine = "regex",
+    ) -> None:
+        if engine not in ("regex", "aho-corasick"):
+            raise ValueError(f"expected `engine` to be 'regex' or 'aho-corasick', got {engine!r}")
+
+        if ignore_case:
+            normalize: _Callable[[str], str] = lambda s: s.lower()
+            re_mode = _re.IGNORECASE
+
+            mapping = {normalize(key): val for key, val in mapping.items()}
+
+        else:
+            normalize: _Callable[[str], str] = lambda s: s
+            re_mode = 0
+            mapping = dict(mapping)
+
+        self._mapping = mapping
+        self._normalize = normalize
+        self._empty = b"" if any(isinstance(key, bytes) for key in mapping) else ""
+        self._max_len = max(map(len, mapping), default=0)
+        self.ignore_case = ignore_case
+        self.engine = engine
+
+        if engine == "aho-corasick":
+            fold = (_folded_byte if self._empty == b"" else _folded_char) if ignore_case else None
+            self._automaton = _AhoCorasick(mapping, fold=fold)  # type: ignore
+            return
+
+        # Place longer ones first to keep shorter subtexts from matching where the longer ones
+        # should take place. For instance given the replacements {'ab': 'AB', 'abc': 'ABC'}
+        # against the text 'hey abc', it should produce 'hey ABC' and not 'hey ABc'
+        rep_sorted = sorted(mapping, key=len, reverse=True)
+        rep_escaped = map(_re.escape, rep_sorted)
+
+        # Create a big OR regex that matches any of the subtexts to replace
+        separator = b"|" if self._empty == b"" else "|"
+        self._pattern = _re.compile(separator.join(rep_escaped), re_mode)  # type: ignore
+
+    def __call__(self, text: _AnyStr, /) -> _AnyStr:
+        if not self._mapping:
+            return text
+
+        if self.engine == "regex":
+            mapping, normalize = self._mapping, self._normalize
+            return self._pattern.sub(lambda match: mapping[normalize(match.group(0))], text)
+
+        parts, *_ = self._replaced(text, len(text))
+        return self._empty.join(parts)  # type: ignore
+
+    def _replaced(self, text: _AnyStr, safe_end: int) -> tuple[list[_AnyStr], _Natural, _Natural]:
+        """
+        Replaced `text` up to the end of the last match starting before `safe_end` (or up to
+        `safe_end` if it is further), that end and the number of replacements.
+        """
+        mapping, normalize = self._mapping, self._normalize
+        parts = []
+        prev_stop = count = 0
+        for start, stop in self._matches(text):
+            if start >= safe_end:
+                break
+            parts.append(text[prev_stop:start])
+            parts.append(mapping[normalize(text[start:stop])])
+            prev_stop = stop
+            count += 1
+
+        end = max(prev_stop, min(max(safe_end, 0), len(text)))
+        parts.append(text[prev_stop:end])
+        return parts, end, count
+
+    def stream(
+        self, source: _Source, sink: _Writable, /, *, chunk_size: int = 1 << 16
+    ) -> _Natural:
+        """
+        Writes the replaced text read from `source` to `sink`, returns the number of
+        replacements.
+
+        `source` is a file-like object (read `chunk_size` characters or bytes at a time) or an
+        iterable of chunks (`str`, or `bytes`-like such as `memoryview`s of a memory-mapped
+        file). Only the last `longest key length - 1` characters of a chunk are held back, in
+        case a match continues in the next one, so the memory used does not depend on the
+        length of the text.
+        """
+        written = 0
+        tail = None
+        for chunk in _chunks(source, chunk_size):
+            buffer = chunk if tail is None else tail + chunk  # type: ignore
+            # a key starting before `safe_end` would be whole in `buffer`
+            parts, end, count = self._replaced(buffer, len(buffer) - self._max_len + 1)
+            sink.write(buffer[:0].join(parts))
+            written += count
+            tail = buffer[end:]
+
+        if tail is None:
+            return 0
+
+        parts, _, count = self._replaced(tail, len(tail))
+        sink.write(tail[:0].join(parts))
+        return written + count
+
+    def sub_many(self, texts: _Iterable[_AnyStr], /) -> _Iterator[_AnyStr]:
+        return map(self, texts)
+
+    def count(self, text: _AnyStr, /) -> _Natural:
+        """
+        Number of replacements `self(text)` makes.
+        """
+        return sum(1 for _ in self._matches(text))
+
+    def _matches(self, text: _AnyStr) -> _Iterator[tuple[_Natural, _Natural]]:
+        """
+        `(start, stop)` of the replaced parts of `text`.
+        """
+        if not self._mapping:
+            return iter(())
+        if self.engine == "regex":
+            return (match.span() for match in self._pattern.finditer(text))
+        return self._automaton.finditer(text)
+
+
+class ReplaceCacheInfo(_NamedTuple):
+    hits: int
+    misses: int
+    max_keys: int
+    keys: int
+    currsize: int
+
+
+class _ContentKey:
+    """
+    `(items, ignore_case, engine)` with its hash computed once, a cached key is then looked up
+    in O(1) instead of rehashing all the items.
+    """
+
+    __slots__ = ("items", "options", "_hash")
+
+    def __init__(self, items: tuple, ignore_case: bool, engine: ReplaceEngine) -> None:
+        self.items = items
+        self.options = (ignore_case, engine)
+        self._hash = hash((items, ignore_case, engine))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, _ContentKey)
+            and self._hash == other._hash
+            and self.options == other.options
+            and self.items == other.items
+        )
+
+
+class _ReplacerCache:
+    """
+    Least recently used compiled `Replacer`s, bounded by the total number of their keys.
+
+    A mapping passed again (the same object, with the same size) is found by its `id`, so only
+    a new or resized mapping is hashed by content. Mappings are not copied, which is why the
+    ones edited in place without changing size are not recompiled.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        # (cached key, replacer) by content, least recently used first
+        self._replacers: _OrderedDict[_ContentKey, tuple[_ContentKey, Replacer]] = _OrderedDict()
+        # (id(mapping), ignore_case, engine) -> (mapping, its size, content key) of the last
+        # mapping object seen for every content key
+        self._by_id: dict[tuple, tuple[_Mapping, int, _ContentKey]] = {}
+        self._ids: dict[_ContentKey, tuple] = {}
+        self._keys = self._hits = self._misses = 0
+        self._lock = _Lock()
+
+    def get(self, mapping: _Mapping, ignore_case: bool, engine: ReplaceEngine) -> Replacer:
+        identity = (id(mapping), ignore_case, engine)
+        with self._lock:
+            entry = self._by_id.get(identity)
+            if entry is not None and entry[0] is mapping and entry[1] == len(mapping):
+                self._hits += 1
+                self._replacers.move_to_end(entry[2])
+                return self._replacers[entry[2]][1]
+
+            key = _ContentKey(tuple(mapping.items()), ignore_case, engine)
+            cached = self._replacers.get(key)
+            if cached is None:
+                self._misses += 1
+                replacer = Replacer(dict(key.items), ignore_case=ignore_case, engine=engine)
+                self._replacers[key] = (key, replacer)
+                self._keys += len(key.items)
+                self._evict()
+            else:
+                self._hits += 1
+                key, replacer = cached
+                self._replacers.move_to_end(key)
+
+            previous = self._ids.get(key)
+            if previous is not None and previous != identity:
+                self._forget(previous, key)
+            self._ids[key] = identity
+            self._by_id[identity] = (mapping, len(mapping), key)
+            return replacer
+
+    def _forget(self, identity: tuple, key: _ContentKey) -> None:
+        entry = self._by_id.get(identity)
+        # the mapping may have been resized and cached under another key since
+        if entry is not None and entry[2] == key:
+            del self._by_id[identity]
+
+    def _evict(self) -> None:
+        # the newest replacer is kept even if it alone has more keys
+        while self._keys > self.max_keys and len(self._replacers) > 1:
+            key, _ = self._replacers.popitem(last=False)
+            self._keys -= len(key.items)
+            if key in self._ids:
+                self._forget(self._ids.pop(key), key)
+
+    def info(self) -> ReplaceCacheInfo:
+        return ReplaceCacheInfo(
+            self._hits, self._misses, self.max_keys, self._keys, len(self._replacers)
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._replacers.clear()
+            self._by_id.clear()
+            self._ids.clear()
+            self._keys = self._hits = self._misses = 0
+
+
+_replacers = _ReplacerCache(max_keys=1 << 17)
+
+
+def replace_many(
+    text: str,
+    /,
+    mapping: _Mapping[str, str],
+    *,
+    ignore_case: bool = False,
+    engine: ReplaceEngine = "regex",
+) -> str:
     """
     Given a text and a replacement map, it returns the replaced text.
 
@@ -15,33 +337,144 @@ def replace_many(text: str, /, mapping: _Mapping[str, str], *, ignore_case: bool
     - `text: str` - text to execute replacements on,
     - `mapping` - replacement dictionary {value to find: value to replace},
     - `ignore_case: bool = False` - whether the match should be case insensitive
+    - `engine = "regex"` - `"aho-corasick"` matches all the keys in one pass over `text`, so
+        its time does not grow with the number of keys (unlike compiling and running one big
+        alternation regex) - use it for thousands of keys. Both engines replace the longest
+        key matching at the leftmost position, but `"aho-corasick"` compares characters with
+        `str.lower` (if `ignore_case`) and does not accept empty keys
 
     Returns
     -------
     `str` - `text` after substitution
 
+    The compiled `Replacer`s of the last used mappings are cached, up to 131072 keys in total,
+    see `replace_many_cache_info`. A mapping object passed again is found by identity in O(1);
+    one edited in place without changing its size is not recompiled, pass a new mapping then
+    (or keep a `Replacer`).
+
     Source of the original code: https://gist.github.com/bgusach/a967e0587d6e01e889fd1d776c5f3729
     """
+    if engine not in ("regex", "aho-corasick"):
+        raise ValueError(f"expected `engine` to be 'regex' or 'aho-corasick', got {engine!r}")
+
     if not mapping:
         return text
 
-    if ignore_case:
-        normalize: _Callable[[str], str] = lambda s: s.lower()
-        re_mode = _re.IGNORECASE
+    return _replacers.get(mapping, ignore_case, engine)(text)
+
 
-        mapping = {normalize(key): val for key, val in mapping.items()}
+def replace_many_stream(
+    source: _Source,
+    sink: _Writable,
+    /,
+    mapping: _Mapping[_AnyStr, _AnyStr],
+    *,
+    ignore_case: bool = False,
+    engine: ReplaceEngine = "regex",
+    chunk_size: int = 1 << 16,
+) -> _Natural:
+    """
+    `replace_many` reading the text from `source` in chunks and writing the result to `sink`,
+    see `Replacer.stream`. Returns the number of replacements.
+
+    >>> with open("app.log", "rb") as src, open("app.redacted.log", "wb") as dst:  # doctest: +SKIP
+    ...     replace_many_stream(src, dst, {b"secret": b"******"})
+    """
+    if engine not in ("regex", "aho-corasick"):
+        raise ValueError(f"expected `engine` to be 'regex' or 'aho-corasick', got {engine!r}")
+
+    return _replacers.get(mapping, ignore_case, engine).stream(source, sink, chunk_size=chunk_size)
+
+
+def replace_many_cache_info() -> ReplaceCacheInfo:
+    """
+    Hit and miss statistics, the key limit, the number of keys and the number of compiled
+    `replace_many` mappings in the cache.
+    """
+    return _replacers.info()
+
+
+def replace_many_cache_clear() -> None:
+    _replacers.clear()
+
+
+# the replacer of a `replace_many_batch` worker process, compiled once by its initializer
+_worker_replacer: _Optional[Replacer] = None
 
-    else:
-        normalize: _Callable[[str], str] = lambda s: s
-        re_mode = 0
 
-    # Place longer ones first to keep shorter subtexts from matching where the longer ones should
-    # take place. For instance given the replacements {'ab': 'AB', 'abc': 'ABC'} against the text
-    # 'hey abc', it should produce 'hey ABC' and not 'hey ABc'
-    rep_sorted = sorted(mapping, key=len, reverse=True)
-    rep_escaped = map(_re.escape, rep_sorted)
+def _init_worker(items: tuple, ignore_case: bool, engine: ReplaceEngine) -> None:
+    global _worker_replacer
+    _worker_replacer = Replacer(dict(items), ignore_case=ignore_case, engine=engine)
 
-    # Create a big OR regex that matches any of the subtexts to replace
-    pattern = _re.compile("|".join(rep_escaped), re_mode)  # type: ignore
 
-    return pattern.sub(lambda match: mapping[normalize(match.group(0))], text)
+def _replaced_chunk(texts: list) -> list:
+    return list(map(_worker_replacer, texts))  # type: ignore
+
+
+def iter_replace_many_batch(
+    texts: _Iterable[_AnyStr],
+    /,
+    mapping: _Mapping[_AnyStr, _AnyStr],
+    *,
+    ignore_case: bool = False,
+    engine: ReplaceEngine = "regex",
+    workers: _Optional[int] = None,
+    chunksize: int = 1024,
+) -> _Iterator[_AnyStr]:
+    """
+    `replace_many(text, mapping, ...)` of every text of `texts`, in order, computed in
+    `workers` processes (`os.cpu_count()` by default).
+
+    Every worker compiles `mapping` once. Texts are sent to the workers in lists of
+    `chunksize`, at most two lists per worker at a time, so `texts` may be a lazy iterable
+    longer than what fits in memory.
+    """
+    if engine not in ("regex", "aho-corasick"):
+        raise ValueError(f"expected `engine` to be 'regex' or 'aho-corasick', got {engine!r}")
+    if chunksize < 1:
+        raise ValueError(f"expected `chunksize` >= 1, got {chunksize}")
+
+    items = tuple(mapping.items())
+    workers = workers or _cpu_count() or 1
+    if workers == 1:
+        yield from Replacer(dict(items), ignore_case=ignore_case, engine=engine).sub_many(texts)
+        return
+
+    iterator = iter(texts)
+    with _ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(items, ignore_case, engine)
+    ) as executor:
+        pending: _deque = _deque()
+        while True:
+            while len(pending) < 2 * workers and (chunk := list(_islice(iterator, chunksize))):
+                pending.append(executor.submit(_replaced_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def replace_many_batch(
+    texts: _Iterable[_AnyStr],
+    /,
+    mapping: _Mapping[_AnyStr, _AnyStr],
+    *,
+    ignore_case: bool = False,
+    engine: ReplaceEngine = "regex",
+    workers: _Optional[int] = None,
+    chunksize: int = 1024,
+) -> list[_AnyStr]:
+    """
+    List of `iter_replace_many_batch` results.
+
+    >>> replace_many_batch(records, {"secret": "***"}, workers=8)  # doctest: +SKIP
+    """
+    return list(
+        iter_replace_many_batch(
+            texts,
+            mapping,
+            ignore_case=ignore_case,
+            engine=engine,
+            workers=workers,
+            chunksize=chunksize,
+        )
+    )
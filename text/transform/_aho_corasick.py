@@ -0,0 +1,105 @@
+from typing import (
+    Annotated as _Annotated,
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    Optional as _Optional,
+)
+
+
+_Natural = _Annotated[int, ">= 0"]
+
+_ROOT = 0
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over `keys`, reporting leftmost-longest non-overlapping matches.
+
+    That is what an alternation regex of the keys sorted by length (longest first) finds:
+    at the leftmost position where any key matches, the longest key matching there. Matching
+    takes O(len(text)) steps regardless of the number of keys, only after a match the
+    characters scanned past it (less than the longest key) are scanned again.
+
+    `fold` is applied to every character of the text before it is matched (e.g. `str.lower`
+    with keys lowercased for case insensitive matching), it must return one character.
+    """
+
+    def __init__(
+        self, keys: _Iterable[str], *, fold: _Optional[_Callable[[str], str]] = None
+    ) -> None:
+        self._fold = fold
+        # transitions, failure links, depths and the length of the longest key that is
+        # a suffix of the node's string (0 if none)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail = [_ROOT]
+        self._depth = [0]
+        self._match_len = [0]
+
+        for key in keys:
+            if not key:
+                raise ValueError("keys must not be empty")
+            node = _ROOT
+            for char in key:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(_ROOT)
+                    self._depth.append(self._depth[node] + 1)
+                    self._match_len.append(0)
+                node = child
+            self._match_len[node] = len(key)
+
+        self._link()
+
+    def _link(self) -> None:
+        goto, fail, match_len = self._goto, self._fail, self._match_len
+        # breadth-first, so the failure target of a node is always processed before it
+        queue = list(goto[_ROOT].values())
+        for node in queue:
+            for char, child in goto[node].items():
+                target = fail[node]
+                while target != _ROOT and char not in goto[target]:
+                    target = fail[target]
+                fail[child] = goto[target].get(char, _ROOT)
+                if not match_len[child]:
+                    match_len[child] = match_len[fail[child]]
+                queue.append(child)
+
+    def __len__(self) -> _Natural:
+        """
+        Number of automaton states, including the root.
+        """
+        return len(self._goto)
+
+    def finditer(self, text: str) -> _Iterator[tuple[_Natural, _Natural]]:
+        """
+        `(start, stop)` of the leftmost-longest non-overlapping matches in `text`.
+        """
+        goto, fail, depth, match_len = self._goto, self._fail, self._depth, self._match_len
+        fold = self._fold
+        # the best match found so far, reported once no match starting before or at its start
+        # can be found anymore, matching goes on from its end then
+        best_start = best_stop = -1
+        node = _ROOT
+        pos, n = 0, len(text)
+        while pos < n or best_stop >= 0:
+            if pos < n:
+                char = fold(text[pos]) if fold is not None else text[pos]
+                while node != _ROOT and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, _ROOT)
+                pos += 1
+
+                length = match_len[node]
+                if length and (best_stop < 0 or pos - length <= best_start):
+                    best_start, best_stop = pos - length, pos
+                # the longest partial match starts at `pos - depth[node]`
+                if best_stop < 0 or best_start >= pos - depth[node]:
+                    continue
+
+            yield best_start, best_stop
+            pos, node = best_stop, _ROOT
+            best_start = best_stop = -1
@@ -3,19 +3,87 @@
 from typing import (
     Literal as _Literal,
     Union as _Union,
-    Iterable as _Iterable,
     TypedDict as _TypedDict,
     Optional as _Optional,
     overload as _overload,
+    Callable as _Callable,
+    Iterable as _Iterable,
+    Iterator as _Iterator,
+    Any as _Any,
 )
+from functools import lru_cache as _lru_cache
+from sys import intern as _intern
 import re as _re
-from itertools import chain as _chain
 
 
 Case = _Literal["camel", "snake", "kebab"]
 Sep = _Union[str, None]
 
 
+def word_bounds(text: str, /) -> list[int]:
+    """
+    Offsets where the words of camelCase identifier `text` start, followed by `len(text)`.
+
+    A word starts at every capital letter (any Unicode one) not preceded by another capital,
+    and at the last capital of an acronym followed by a lowercase letter. Digits and other
+    characters stay in the word they follow, so the words always cover the whole text.
+
+    >>> word_bounds("parseHTTPRequest2Json")
+    [0, 5, 9, 17, 21]
+    """
+    return _word_bounds(text)
+
+
+# word starts after the first character: a capital not preceded by a capital, or followed
+# by a lowercase letter, in ASCII identifiers and in the case shapes of the others
+_WORD_STARTS = _re.compile("[A-Z](?:(?<![A-Z].)|(?=[a-z]))")
+# the words `_WORD_STARTS` bounds, only for lowercasing ASCII identifiers: slicing words
+# out of the offsets in Python takes about twice as long as `findall`
+_ASCII_WORDS = _re.compile("[A-Z]+(?=[A-Z][a-z])|[A-Z]*[^A-Z]+|[A-Z]+")
+
+
+def _word_bounds(text: str, lower: _Optional[str] = None) -> list[int]:
+    """
+    `word_bounds`, `lower` is `text.lower()` if the caller has it already.
+    """
+    if not text:
+        return [0]
+
+    if not text.isascii():
+        text = _case_shape(text, text.lower() if lower is None else lower)
+    return [0, *map(_re.Match.start, _WORD_STARTS.finditer(text, 1)), len(text)]
+
+
+def _case_shape(text: str, lower: str) -> str:
+    """
+    `text` with every capital replaced by `A`, every lowercase letter by `a` and every other
+    character by `.`, so the ASCII rules apply to any text.
+    """
+    if len(lower) == len(text):
+        # lowercasing changes only the capitals
+        capitals = [char != low for char, low in zip(text, lower)]
+    else:
+        capitals = [char.isupper() for char in text]
+    return "".join(
+        ["A" if upper else "a" if char.islower() else "." for char, upper in zip(text, capitals)]
+    )
+
+
+def _lower_words(text: str) -> list[str]:
+    if text.isascii():
+        return list(map(str.lower, _ASCII_WORDS.findall(text)))
+
+    lower = text.lower()
+    bounds = _word_bounds(text, lower)
+    if len(lower) != len(text):
+        return [text[start:stop].lower() for start, stop in _pairs(bounds)]
+    return [lower[start:stop] for start, stop in _pairs(bounds)]
+
+
+def _pairs(bounds: list[int]) -> _Iterator[tuple[int, int]]:
+    return zip(bounds, bounds[1:])
+
+
 class _SepMapping(_TypedDict):
     camel: None
     snake: str
@@ -116,31 +184,221 @@ def converted_case(
     else:
         raise ValueError(f"expected `new_sep` or `new_case` argument")
 
-    subgroups: _Iterable[str]
+    return _converter(old_sep, new_sep, capitalize_first_letter)(text)
 
-    # from camelCase
-    if old_sep is None:
-        # to camelCase
-        if new_sep is None:
-            return text
 
-        camelcase_group_pattern = _re.compile(r"(^[^A-Z]+|[A-Z_]+(?![^A-Z])|[A-Z][^A-Z_]+)")
-        subgroups = (m.group(0).lower() for m in camelcase_group_pattern.finditer(text))
+def _sep_of(case_or_sep: _Union[Case, Sep]) -> Sep:
+    if case_or_sep is None:
+        return None
+    return _SEP_MAPPING.get(case_or_sep, case_or_sep)  # type: ignore
+
+
+def case_converter(
+    old_case_or_sep: _Union[Case, Sep],
+    new_case_or_sep: _Union[Case, Sep],
+    /,
+    *,
+    capitalize_first_letter: bool = False,
+    memo_size: int = 0,
+) -> _Callable[[str], str]:
+    """
+    `converted_case` with the cases (or separators) and options fixed, for converting many
+    identifiers - the arguments are resolved once instead of on every call.
+
+    With `memo_size`, the results for the last `memo_size` distinct identifiers are memoized
+    (`functools.lru_cache`, see `cache_info` of the returned function).
+
+    >>> to_snake = case_converter("camel", "snake", memo_size=1024)
+    >>> to_snake("userId")
+    'user_id'
+    """
+    converter = _converter(
+        _sep_of(old_case_or_sep), _sep_of(new_case_or_sep), capitalize_first_letter
+    )
+    if memo_size:
+        return _lru_cache(maxsize=memo_size)(converter)
+    return converter
+
 
+def convert_keys(
+    obj: _Any,
+    old_case_or_sep: _Union[Case, Sep],
+    new_case_or_sep: _Union[Case, Sep],
+    /,
+    *,
+    capitalize_first_letter: bool = False,
+) -> _Any:
+    """
+    Converts the case of the `str` keys of all the dicts in the tree of dicts and lists `obj`
+    (e.g. a parsed JSON payload).
+
+    Dicts and lists with nothing to convert (and other values) are not copied but returned
+    as they are, so the result may share them with `obj`. Converted keys are memoized and
+    interned, so a key repeated in thousands of objects is converted once and stored once.
+
+    >>> convert_keys({"userId": 1, "tags": [{"tagName": "a"}], "raw": [1, 2]}, "camel", "snake")
+    {'user_id': 1, 'tags': [{'tag_name': 'a'}], 'raw': [1, 2]}
+
+    Raises
+    ------
+    `ValueError` if keys of a dict collide after the conversion (e.g. `"userId"` and `"user_id"`).
+    """
+    convert = _key_converter(
+        _sep_of(old_case_or_sep), _sep_of(new_case_or_sep), capitalize_first_letter
+    )
+    return _converted_keys(obj, convert)
+
+
+def iter_convert_keys(
+    objs: _Iterable[_Any],
+    old_case_or_sep: _Union[Case, Sep],
+    new_case_or_sep: _Union[Case, Sep],
+    /,
+    *,
+    capitalize_first_letter: bool = False,
+) -> _Iterator[_Any]:
+    """
+    `convert_keys` of every object of `objs` (e.g. records of a JSON lines stream), lazily.
+    """
+    convert = _key_converter(
+        _sep_of(old_case_or_sep), _sep_of(new_case_or_sep), capitalize_first_letter
+    )
+    return (_converted_keys(obj, convert) for obj in objs)
+
+
+def converted_case_batch(
+    texts: _Any,
+    old_case_or_sep: _Union[Case, Sep],
+    new_case_or_sep: _Union[Case, Sep],
+    /,
+    *,
+    capitalize_first_letter: bool = False,
+) -> _Any:
+    """
+    `converted_case` of every text of `texts` - an iterable of `str` or a NumPy string array
+    (a byte string one is decoded as UTF-8).
+
+    Every distinct text is converted once and the results are scattered back to all of its
+    occurences, so many repeated names (e.g. the headers of thousands of CSV files) cost as
+    much as the distinct ones. Returns a list, or an array of the same shape for an array.
+
+    >>> converted_case_batch(["userId", "createdAt", "userId"], "camel", "snake")
+    ['user_id', 'created_at', 'user_id']
+    """
+    convert = _converter(
+        _sep_of(old_case_or_sep), _sep_of(new_case_or_sep), capitalize_first_letter
+    )
+    return _mapped_unique(convert, texts, keep_str_dtype=True)
+
+
+_WHITESPACE = _re.compile(r"\s")
+_LETTER = _re.compile(r"[^\W\d_]")
+
+
+def detect_case(text: str, /) -> _Optional[Case]:
+    """
+    Case of identifier `text`: `"snake"` if it contains `_`, `"kebab"` if it contains `-`,
+    `"camel"` otherwise (single words included).
+
+    `None` if it contains both separators, or it is not an identifier - it is empty, contains
+    whitespace (e.g. the header `"First Name"`) or no letter (e.g. `"123"`). An all-caps word
+    like `"USER"` or `"HTTP2"` is `"camel"`: it is one acronym, which snake or kebab case
+    lowercases.
+    """
+    if _WHITESPACE.search(text) or not _LETTER.search(text):
+        return None
+    if "_" in text:
+        return None if "-" in text else "snake"
+    return "kebab" if "-" in text else "camel"
+
+
+def detect_case_batch(texts: _Any, /) -> _Any:
+    """
+    `detect_case` of every text of `texts`, see `converted_case_batch` (arrays of `object`
+    are returned for arrays).
+    """
+    return _mapped_unique(detect_case, texts, keep_str_dtype=False)
+
+
+def _mapped_unique(
+    function: _Callable[[str], _Any], texts: _Any, *, keep_str_dtype: bool
+) -> _Any:
+    # NumPy arrays are recognized without importing NumPy unless one is passed
+    shape = getattr(texts, "shape", None)
+    if shape is not None and hasattr(texts, "ravel"):
+        import numpy
+
+        if texts.dtype.kind == "S":
+            texts = numpy.char.decode(texts, "utf-8")
+        uniques, inverse = numpy.unique(texts.ravel(), return_inverse=True)
+        results = numpy.array([function(text) for text in uniques.tolist()], dtype=object)
+        scattered = results[inverse].reshape(shape)
+        if keep_str_dtype and texts.dtype.kind == "U":
+            return scattered.astype(str)
+        return scattered
+
+    texts = texts if isinstance(texts, list) else list(texts)
+    results = {text: function(text) for text in dict.fromkeys(texts)}
+    return [results[text] for text in texts]
+
+
+@_lru_cache(maxsize=64)
+def _key_converter(
+    old_sep: Sep, new_sep: Sep, capitalize_first_letter: bool
+) -> _Callable[[str], str]:
+    convert = _converter(old_sep, new_sep, capitalize_first_letter)
+    return _lru_cache(maxsize=4096)(lambda key: _intern(convert(key)))
+
+
+def _converted_keys(obj: _Any, convert: _Callable[[str], str]) -> _Any:
+    if isinstance(obj, dict):
+        converted = {}
+        changed = False
+        for key, value in obj.items():
+            new_key = convert(key) if isinstance(key, str) else key
+            if new_key in converted:
+                raise ValueError(f"key {key!r} converts to {new_key!r}, which is already a key")
+            new_value = _converted_keys(value, convert)
+            changed = changed or new_value is not value or new_key != key
+            converted[new_key] = new_value
+        return converted if changed else obj
+
+    if isinstance(obj, list):
+        converted_list = [_converted_keys(value, convert) for value in obj]
+        if any(new is not old for new, old in zip(converted_list, obj)):
+            return converted_list
+        return obj
+
+    return obj
+
+
+@_lru_cache(maxsize=64)
+def _converter(old_sep: Sep, new_sep: Sep, capitalize_first_letter: bool) -> _Callable[[str], str]:
+    # from camelCase to camelCase
+    if old_sep is None and new_sep is None:
+        return lambda text: text
+
+    split: _Callable[[str], list[str]]
+    if old_sep is None:
+        split = _lower_words
     else:
-        subgroups = (sg for sg in text.split(old_sep))
+        split = lambda text: text.split(old_sep)
+
+    if new_sep is not None:
+        return lambda text: new_sep.join(split(text))  # type: ignore
 
     # to camelCase
-    if new_sep is None:
-        if capitalize_first_letter:
-            return "".join(sg[0].upper() + sg[1:] if sg else "" for sg in subgroups)
+    def to_camel_case(text: str) -> str:
+        subgroups = split(text)
+        if not subgroups:
+            return ""
 
-        first_subgroup = next(subgroups)
-        return "".join(
-            _chain([first_subgroup], (sg[0].upper() + sg[1:] if sg else "" for sg in subgroups))
-        )
+        first_subgroup = subgroups[0]
+        if capitalize_first_letter and first_subgroup:
+            first_subgroup = first_subgroup[0].upper() + first_subgroup[1:]
+        return first_subgroup + "".join(sg[0].upper() + sg[1:] for sg in subgroups[1:] if sg)
 
-    return new_sep.join(subgroups)
+    return to_camel_case
 
 
 def __case_dispatch_old_sep(
@@ -192,9 +450,7 @@ def snake_case(
     **kwargs: _Union[Case, Sep],
 ) -> str:
     old_sep = __case_dispatch_old_sep(args, kwargs)
-    return converted_case(
-        text, old_sep=old_sep, new_sep="_", capitalize_first_letter=capitalize_first_letter
-    )
+    return _converter(old_sep, "_", capitalize_first_letter)(text)
 
 
 @_overload
@@ -215,9 +471,7 @@ def camel_case(
     **kwargs: _Union[Case, Sep],
 ) -> str:
     old_sep = __case_dispatch_old_sep(args, kwargs)
-    return converted_case(
-        text, old_sep=old_sep, new_sep=None, capitalize_first_letter=capitalize_first_letter
-    )
+    return _converter(old_sep, None, capitalize_first_letter)(text)
 
 
 @_overload
@@ -238,6 +492,4 @@ def kebab_case(
     **kwargs: _Union[Case, Sep],
 ) -> str:
     old_sep = __case_dispatch_old_sep(args, kwargs)
-    return converted_case(
-        text, old_sep=old_sep, new_sep="-", capitalize_first_letter=capitalize_first_letter
-    )
+    return _converter(old_sep, "-", capitalize_first_letter)(text)